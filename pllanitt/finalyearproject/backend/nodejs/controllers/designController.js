@@ -538,6 +538,47 @@ const parcelController = {
     }
   },
 
+  // Create many parcels of one project with a single INSERT
+  createParcelsBulk: async (req, res) => {
+    try {
+      const { projectId, parcels } = req.body;
+      const userId = req.user?.id;
+
+      if (!userId) {
+        return res.status(401).json({ error: 'Authentication required' });
+      }
+
+      if (!Array.isArray(parcels) || parcels.length === 0) {
+        return res.status(400).json({ error: 'parcels must be a non-empty array' });
+      }
+
+      // 422 rather than 404: clients treat a 404 from this route as "bulk route not available"
+      const project = await Project.findOne({ where: { id: projectId, is_active: true } });
+      if (!project) {
+        return res.status(422).json({ error: 'Project not found' });
+      }
+
+      if (project.created_by !== userId && req.user?.role !== 'admin') {
+        return res.status(403).json({ error: 'Permission denied' });
+      }
+
+      // validate: true checks every row before the insert, so either all parcels are saved or none
+      const created = await Parcel.bulkCreate(
+        parcels.map(({ projectId: _projectId, ...parcelData }) => ({
+          ...parcelData,
+          project_id: projectId,
+          created_by: userId
+        })),
+        { validate: true }
+      );
+
+      res.status(201).json({ created: created.length });
+    } catch (error) {
+      console.error('Error creating parcels:', error);
+      res.status(500).json({ error: 'Failed to create parcels', details: error.message });
+    }
+  },
+
   updateParcel: async (req, res) => {
     try {
       const { id } = req.params;
@@ -44,6 +44,7 @@ router.delete('/greenspaces/:id', greenSpaceController.deleteGreenSpace);
 router.get('/parcels/project/:projectId', parcelController.getProjectParcels);
 router.get('/parcels/:id', parcelController.getParcel);
 router.post('/parcels', parcelController.createParcel);
+router.post('/parcels/bulk', parcelController.createParcelsBulk);
 router.put('/parcels/:id', parcelController.updateParcel);
 router.delete('/parcels/:id', parcelController.deleteParcel);
 
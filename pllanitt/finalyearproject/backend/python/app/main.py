@@ -1,5 +1,5 @@
 from fastapi import FastAPI, Request, UploadFile, File, HTTPException, Form
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from shapely.geometry import (
@@ -16,6 +16,7 @@ from shapely.geometry import (
 )
 from shapely.validation import explain_validity
 from shapely import affinity
+import shapely
 import rasterio
 from rasterio.mask import mask as rasterio_mask
 from rasterio.crs import CRS
@@ -23,6 +24,8 @@ from rasterio.warp import calculate_default_transform, reproject, Resampling
 import numpy as np
 import random
 import math
+import re
+import functools
 import os
 import requests
 import matplotlib
@@ -30,16 +33,23 @@ matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.path import Path as MplPath
-from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.collections import LineCollection, EllipseCollection, PolyCollection, PatchCollection
+from matplotlib.colors import LinearSegmentedColormap, to_rgba
 import json
+import asyncio
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from contextlib import asynccontextmanager
 import logging
 import tempfile
 import shutil
 import time
 from sklearn.cluster import KMeans
-from collections import Counter
+from collections import Counter, OrderedDict
+from itertools import chain
+from types import MappingProxyType
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
 from pathlib import Path
 import sys
@@ -69,6 +79,18 @@ except ImportError:
     OPENAI_AVAILABLE = False
     openai = None
 
+# PostgreSQL driver (connection pool is created in the app lifespan)
+try:
+    import psycopg2
+    from psycopg2.extras import RealDictCursor
+    from psycopg2.pool import ThreadedConnectionPool
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+    psycopg2 = None
+    RealDictCursor = None
+    ThreadedConnectionPool = None
+
 # Import ML-based optimizer
 ML_OPTIMIZER_AVAILABLE = False
 try:
@@ -180,6 +202,8 @@ except ImportError as e:
             return {"success": False, "error": "Road network engine not available"}
 from shapely.geometry.base import BaseGeometry
 from scipy.ndimage import distance_transform_edt
+from scipy.spatial import cKDTree
+from scipy.stats import qmc
 from rasterio.features import rasterize, shapes
 from shapely.ops import voronoi_diagram
 from sklearn.preprocessing import StandardScaler
@@ -525,7 +549,30 @@ def fetch_hydrology_data(bounds):
     }
 
 
-app = FastAPI()
+DB_CONFIG = {
+    "host": "localhost",
+    "database": "plan-it",
+    "user": "postgres",
+    "password": "iampro24",
+    "port": "5432",
+}
+DB_POOL_MAX_CONNECTIONS = int(os.getenv("DB_POOL_MAX_CONNECTIONS", "10"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the PostgreSQL connection pool on startup and close it on shutdown."""
+    app.state.pg_pool = None
+    if PSYCOPG2_AVAILABLE:
+        try:
+            # minconn=0 so startup does not fail when the database is down
+            app.state.pg_pool = ThreadedConnectionPool(0, DB_POOL_MAX_CONNECTIONS, **DB_CONFIG)
+        except Exception as e:
+            logger.warning(f"Could not create database connection pool: {e}")
+    yield
+    if app.state.pg_pool is not None:
+        app.state.pg_pool.closeall()
+
+app = FastAPI(lifespan=lifespan)
 
 # Allow React frontend
 app.add_middleware(
@@ -6247,6 +6294,64 @@ def ensure_within_polygon(geometry: Dict, polygon_boundary: Dict) -> Dict:
         logger.warning(f"Error ensuring geometry within polygon: {e}")
         return geometry
 
+def clip_zone_features_to_polygon(features: List[Dict], zone_types, polygon_boundary: Dict) -> Dict[int, Dict]:
+    """
+    Batch version of ensure_within_polygon for zoning features.
+    Builds one STRtree over the zone geometries so only zones straddling the
+    boundary are intersected; zones fully inside are kept as-is and zones
+    fully outside are dropped.
+    Returns {feature_index: clipped_geometry_or_None} for features whose
+    zone_type is in zone_types.
+    """
+    candidates = [
+        (idx, feature.get('geometry'))
+        for idx, feature in enumerate(features)
+        if feature.get('properties', {}).get('zone_type', '').lower() in zone_types
+        and feature.get('geometry')
+    ]
+    if not candidates:
+        return {}
+    
+    try:
+        boundary_shape = shape(polygon_boundary)
+        geoms = np.array([shape(geometry) for _, geometry in candidates], dtype=object)
+        tree = shapely.STRtree(geoms)
+        inside_idx = tree.query(boundary_shape, predicate='contains')
+        crosses_idx = np.setdiff1d(tree.query(boundary_shape, predicate='intersects'), inside_idx)
+    except Exception as e:
+        logger.warning(f"Batch clipping failed, clipping zones individually: {e}")
+        return {
+            idx: ensure_within_polygon(geometry, polygon_boundary)
+            for idx, geometry in candidates
+        }
+    
+    # Anything not touched by the boundary is fully outside and gets dropped
+    clipped = {idx: None for idx, _ in candidates}
+    for i in inside_idx:
+        idx, geometry = candidates[i]
+        clipped[idx] = geometry
+    
+    try:
+        intersections = shapely.intersection(geoms[crosses_idx], boundary_shape)
+    except Exception as e:
+        # One invalid zone fails the whole batch: clip the straddling zones one by one,
+        # keeping ensure_within_polygon's fallback to the original geometry
+        logger.warning(f"Batch clipping failed, clipping straddling zones individually: {e}")
+        for i in crosses_idx:
+            idx, geometry = candidates[i]
+            clipped[idx] = ensure_within_polygon(geometry, polygon_boundary)
+        return clipped
+    
+    for i, part in zip(crosses_idx, intersections):
+        idx, _ = candidates[i]
+        if part.is_empty:
+            continue
+        if isinstance(part, MultiPolygon):
+            part = max(part.geoms, key=lambda p: p.area)
+        clipped[idx] = mapping(part)
+    
+    return clipped
+
 def create_building_geometry_within_zone(zone_geometry: Dict, building_footprint_sqm: float, polygon_boundary: Dict = None, setback_percent: float = 0.1) -> Dict:
     """
     Create a building geometry within a zone with setbacks.
@@ -6349,6 +6454,11 @@ def generate_buildings_from_zones(zoning_result: Dict, project_id: int = None, p
     
     zone_counter = {}
     
+    # Clip all candidate zones to the polygon boundary in one batch
+    clipped_geometries = {}
+    if polygon_boundary:
+        clipped_geometries = clip_zone_features_to_polygon(zoning_result['features'], building_zones, polygon_boundary)
+    
     for idx, feature in enumerate(zoning_result['features']):
         zone_type = feature.get('properties', {}).get('zone_type', '').lower()
         
@@ -6363,7 +6473,7 @@ def generate_buildings_from_zones(zoning_result: Dict, project_id: int = None, p
         
         # Clip zone to polygon boundary if provided
         if polygon_boundary:
-            zone_geometry = ensure_within_polygon(zone_geometry, polygon_boundary)
+            zone_geometry = clipped_geometries.get(idx)
             if zone_geometry is None:
                 continue
         
@@ -6476,10 +6586,13 @@ def calculate_zone_centroid(zone_geometry: Dict, polygon_boundary: Dict = None)
         logger.warning(f"Error calculating centroid: {e}")
         # Fallback: calculate from coordinates
         coords = zone_geometry.get('coordinates', [[]])[0] if zone_geometry.get('type') == 'Polygon' else []
-        if coords:
-            center_lon = sum(c[0] for c in coords) / len(coords)
-            center_lat = sum(c[1] for c in coords) / len(coords)
-            return (center_lon, center_lat)
+        coords_arr = np.asarray(coords, dtype=np.float64)
+        if coords_arr.ndim == 2 and coords_arr.shape[0] > 0:
+            # Drop the closing vertex of a closed ring so it isn't counted twice
+            if coords_arr.shape[0] > 1 and np.array_equal(coords_arr[0], coords_arr[-1]):
+                coords_arr = coords_arr[:-1]
+            center_lon, center_lat = coords_arr[:, :2].mean(axis=0)
+            return (float(center_lon), float(center_lat))
         return (0, 0)
 
 def generate_infrastructure_from_zones(zoning_result: Dict, project_id: int = None, polygon_boundary: Dict = None) -> List[Dict]:
@@ -6519,6 +6632,11 @@ def generate_infrastructure_from_zones(zoning_result: Dict, project_id: int = No
     
     zone_counters = {}
     
+    # Clip all candidate zones to the polygon boundary in one batch
+    clipped_geometries = {}
+    if polygon_boundary:
+        clipped_geometries = clip_zone_features_to_polygon(zoning_result['features'], infrastructure_mapping, polygon_boundary)
+    
     for idx, feature in enumerate(zoning_result['features']):
         zone_type = feature.get('properties', {}).get('zone_type', '').lower()
         
@@ -6533,7 +6651,7 @@ def generate_infrastructure_from_zones(zoning_result: Dict, project_id: int = No
         
         # Clip zone to polygon boundary if provided
         if polygon_boundary:
-            zone_geometry = ensure_within_polygon(zone_geometry, polygon_boundary)
+            zone_geometry = clipped_geometries.get(idx)
             if zone_geometry is None:
                 continue
         
@@ -6615,6 +6733,16 @@ def generate_infrastructure_from_zones(zoning_result: Dict, project_id: int = No
     
     return infrastructure
 
+# Green space type by zone size: hectare bucket edges and the
+# (type, vegetation, features) template for each bucket
+GREEN_SPACE_HECTARE_BUCKETS = np.array([0.1, 1.0, 5.0])
+GREEN_SPACE_TEMPLATES = (
+    ('Green Corridor', 'Grassland', {}),
+    ('Pocket Park', 'Urban Garden', {'benches': True}),
+    ('Garden', 'Mixed', {'playground': True, 'trails': True}),
+    ('Park', 'Forest', {'trails': True, 'playground': True, 'sports': True}),
+)
+
 def identify_green_spaces_from_zones(zoning_result: Dict, project_id: int = None, polygon_boundary: Dict = None) -> List[Dict]:
     """
     Identify and extract green spaces from zoning output.
@@ -6635,6 +6763,12 @@ def identify_green_spaces_from_zones(zoning_result: Dict, project_id: int = None
     green_zone_types = ['green', 'green_space', 'conservation', 'park', 'recreation']
     
     green_space_counter = 1
+    green_zones = []
+    
+    # Clip all candidate zones to the polygon boundary in one batch
+    clipped_geometries = {}
+    if polygon_boundary:
+        clipped_geometries = clip_zone_features_to_polygon(zoning_result['features'], green_zone_types, polygon_boundary)
     
     for idx, feature in enumerate(zoning_result['features']):
         zone_type = feature.get('properties', {}).get('zone_type', '').lower()
@@ -6650,7 +6784,7 @@ def identify_green_spaces_from_zones(zoning_result: Dict, project_id: int = None
         
         # Clip zone to polygon boundary if provided
         if polygon_boundary:
-            zone_geometry = ensure_within_polygon(zone_geometry, polygon_boundary)
+            zone_geometry = clipped_geometries.get(idx)
             if zone_geometry is None:
                 continue
         
@@ -6675,30 +6809,27 @@ def identify_green_spaces_from_zones(zoning_result: Dict, project_id: int = None
         if zone_area_sqm < 50:  # Less than 50 sqm
             continue
         
-        # Determine green space type based on ACTUAL area
-        if zone_area_hectares >= 5:
-            green_type = 'Park'
-            vegetation_type = 'Forest'
-            features = {'trails': True, 'playground': True, 'sports': True}
-        elif zone_area_hectares >= 1:
-            green_type = 'Garden'
-            vegetation_type = 'Mixed'
-            features = {'playground': True, 'trails': True}
-        elif zone_area_hectares >= 0.1:
-            green_type = 'Pocket Park'
-            vegetation_type = 'Urban Garden'
-            features = {'benches': True}
-        else:
-            green_type = 'Green Corridor'
-            vegetation_type = 'Grassland'
-            features = {}
+        green_zones.append((idx, feature, zone_type, zone_geometry, zone_area_sqm, zone_area_hectares))
+    
+    if not green_zones:
+        return green_spaces
+    
+    # Determine green space type based on ACTUAL area, for all zones at once
+    bucket_indices = np.searchsorted(
+        GREEN_SPACE_HECTARE_BUCKETS,
+        [zone[5] for zone in green_zones],
+        side='right'
+    )
+    
+    for (idx, feature, zone_type, zone_geometry, zone_area_sqm, zone_area_hectares), bucket in zip(green_zones, bucket_indices):
+        green_type, vegetation_type, features = GREEN_SPACE_TEMPLATES[bucket]
         
         green_space = {
             'name': f"{green_type} {green_space_counter}",
             'type': green_type,
             'area': round(zone_area_sqm, 2),  # ACTUAL zone area
             'geometry': zone_geometry,  # ACTUAL zone geometry (clipped to polygon)
-            'features': features,
+            'features': dict(features),
             'vegetation_type': vegetation_type,
             'accessibility': True,
             'status': 'Planned',
@@ -6720,6 +6851,86 @@ def identify_green_spaces_from_zones(zoning_result: Dict, project_id: int = None
     
     return green_spaces
 
+# Small TTL LRU for the zoning -> buildings/infrastructure/green-space pipeline.
+# The UI often calls both comprehensive endpoints, or re-runs one, with the same input.
+ZONING_PIPELINE_CACHE = OrderedDict()
+ZONING_PIPELINE_CACHE_SIZE = 128
+ZONING_PIPELINE_CACHE_TTL = 300  # seconds
+
+def fetch_polygon_geometry(pool, polygon_id: int) -> Optional[Dict]:
+    """
+    Fetch the stored GeoJSON of a drawn polygon using a pooled connection.
+    Returns None if the polygon is missing or the database is unavailable.
+    """
+    if pool is None:
+        logger.warning("Could not fetch polygon geometry: database pool not available")
+        return None
+    
+    conn = None
+    try:
+        conn = pool.getconn()
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("SELECT geojson FROM polygons WHERE id = %s", (polygon_id,))
+            polygon_result = cur.fetchone()
+        conn.rollback()  # end the read transaction before returning the connection
+        
+        if polygon_result and polygon_result['geojson']:
+            logger.info(f"Retrieved polygon geometry for polygon {polygon_id}")
+            return polygon_result['geojson']
+    except Exception as e:
+        logger.warning(f"Could not fetch polygon geometry: {e}")
+    finally:
+        if conn is not None:
+            pool.putconn(conn)
+    return None
+
+def _zoning_pipeline_key(zoning_result: Dict, project_id, polygon_geometry) -> str:
+    """Hash the canonicalized pipeline inputs into a cache key."""
+    canonical = json.dumps(
+        [zoning_result, polygon_geometry, project_id],
+        sort_keys=True,
+        separators=(',', ':'),
+        default=str
+    )
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+ZONING_PIPELINE_OUTPUTS = ('buildings', 'infrastructure', 'green_spaces')
+
+def run_zoning_pipeline(zoning_result: Dict, project_id: int = None, polygon_geometry: Dict = None,
+                        outputs=ZONING_PIPELINE_OUTPUTS) -> tuple:
+    """
+    Generate the requested outputs ('buildings', 'infrastructure', 'green_spaces') from a zoning result.
+    Each output is cached under the input hash for ZONING_PIPELINE_CACHE_TTL seconds, and only
+    outputs not cached yet are generated.
+    Returns the outputs in the order requested.
+    """
+    key = _zoning_pipeline_key(zoning_result, project_id, polygon_geometry)
+    now = time.time()
+    
+    cached = ZONING_PIPELINE_CACHE.get(key)
+    if cached is not None and now - cached[0] >= ZONING_PIPELINE_CACHE_TTL:
+        del ZONING_PIPELINE_CACHE[key]
+        cached = None
+    if cached is None:
+        cached = (now, {})
+        ZONING_PIPELINE_CACHE[key] = cached
+        if len(ZONING_PIPELINE_CACHE) > ZONING_PIPELINE_CACHE_SIZE:
+            ZONING_PIPELINE_CACHE.popitem(last=False)
+    else:
+        ZONING_PIPELINE_CACHE.move_to_end(key)
+    
+    generators = {
+        'buildings': generate_buildings_from_zones,
+        'infrastructure': generate_infrastructure_from_zones,
+        'green_spaces': identify_green_spaces_from_zones,
+    }
+    generated = cached[1]
+    for name in outputs:
+        if name not in generated:
+            generated[name] = generators[name](zoning_result, project_id, polygon_geometry)
+    
+    return tuple(generated[name] for name in outputs)
+
 @app.post("/api/zoning/generate_buildings_infrastructure")
 async def generate_buildings_infrastructure_from_zoning(request: Request):
     """
@@ -6758,33 +6969,7 @@ async def generate_buildings_infrastructure_from_zoning(request: Request):
         
         # Get polygon geometry if polygon_id is provided
         if not polygon_geometry and polygon_id:
-            try:
-                import psycopg2
-                from psycopg2.extras import RealDictCursor
-                
-                conn = psycopg2.connect(
-                    host="localhost",
-                    database="plan-it",
-                    user="postgres",
-                    password="iampro24",
-                    port="5432"
-                )
-                cur = conn.cursor(cursor_factory=RealDictCursor)
-                cur.execute("SELECT geojson FROM polygons WHERE id = %s", (polygon_id,))
-                polygon_result = cur.fetchone()
-                
-                if polygon_result and polygon_result['geojson']:
-                    polygon_geometry = polygon_result['geojson']
-                    logger.info(f"Retrieved polygon geometry for polygon {polygon_id}")
-                
-                cur.close()
-                conn.close()
-            except Exception as e:
-                logger.warning(f"Could not fetch polygon geometry: {e}")
-        
-        # Store polygon geometry in zoning result for use in generation functions
-        if polygon_geometry:
-            zoning_result['polygon_geometry'] = polygon_geometry
+            polygon_geometry = fetch_polygon_geometry(request.app.state.pg_pool, polygon_id)
         
         result = {
             'success': True,
@@ -6794,23 +6979,23 @@ async def generate_buildings_infrastructure_from_zoning(request: Request):
             'summary': {}
         }
         
-        # Generate buildings (with polygon boundary)
-        if options.get('generate_buildings', True):
-            buildings = generate_buildings_from_zones(zoning_result, project_id, polygon_geometry)
-            result['buildings'] = buildings
-            logger.info(f"Generated {len(buildings)} buildings from zoning (clipped to polygon)")
-        
-        # Generate infrastructure (with polygon boundary)
-        if options.get('generate_infrastructure', True):
-            infrastructure = generate_infrastructure_from_zones(zoning_result, project_id, polygon_geometry)
-            result['infrastructure'] = infrastructure
-            logger.info(f"Generated {len(infrastructure)} infrastructure items from zoning (within polygon)")
+        # Generate only the requested elements (with polygon boundary), cached with process_comprehensive
+        requested = [
+            name for name, option in (
+                ('buildings', 'generate_buildings'),
+                ('infrastructure', 'generate_infrastructure'),
+                ('green_spaces', 'identify_green_spaces'),
+            )
+            if options.get(option, True)
+        ]
+        result.update(zip(requested, run_zoning_pipeline(zoning_result, project_id, polygon_geometry, requested)))
         
-        # Identify green spaces (with polygon boundary)
-        if options.get('identify_green_spaces', True):
-            green_spaces = identify_green_spaces_from_zones(zoning_result, project_id, polygon_geometry)
-            result['green_spaces'] = green_spaces
-            logger.info(f"Identified {len(green_spaces)} green spaces from zoning (clipped to polygon)")
+        if 'buildings' in requested:
+            logger.info(f"Generated {len(result['buildings'])} buildings from zoning (clipped to polygon)")
+        if 'infrastructure' in requested:
+            logger.info(f"Generated {len(result['infrastructure'])} infrastructure items from zoning (within polygon)")
+        if 'green_spaces' in requested:
+            logger.info(f"Identified {len(result['green_spaces'])} green spaces from zoning (clipped to polygon)")
         
         # Create summary
         result['summary'] = {
@@ -6970,38 +7155,10 @@ async def process_zoning_comprehensive(request: Request):
         
         # Get polygon geometry if polygon_id is provided
         if not polygon_geometry and polygon_id:
-            try:
-                import psycopg2
-                from psycopg2.extras import RealDictCursor
-                
-                conn = psycopg2.connect(
-                    host="localhost",
-                    database="plan-it",
-                    user="postgres",
-                    password="iampro24",
-                    port="5432"
-                )
-                cur = conn.cursor(cursor_factory=RealDictCursor)
-                cur.execute("SELECT geojson FROM polygons WHERE id = %s", (polygon_id,))
-                polygon_result = cur.fetchone()
-                
-                if polygon_result and polygon_result['geojson']:
-                    polygon_geometry = polygon_result['geojson']
-                    logger.info(f"Retrieved polygon geometry for polygon {polygon_id}")
-                
-                cur.close()
-                conn.close()
-            except Exception as e:
-                logger.warning(f"Could not fetch polygon geometry: {e}")
-        
-        # Store polygon geometry in zoning result
-        if polygon_geometry:
-            zoning_result['polygon_geometry'] = polygon_geometry
+            polygon_geometry = fetch_polygon_geometry(request.app.state.pg_pool, polygon_id)
         
         # Generate all elements (with polygon boundary)
-        buildings = generate_buildings_from_zones(zoning_result, project_id, polygon_geometry)
-        infrastructure = generate_infrastructure_from_zones(zoning_result, project_id, polygon_geometry)
-        green_spaces = identify_green_spaces_from_zones(zoning_result, project_id, polygon_geometry)
+        buildings, infrastructure, green_spaces = run_zoning_pipeline(zoning_result, project_id, polygon_geometry)
         
         result = {
             'success': True,
@@ -7126,6 +7283,9 @@ if ML_MODELS_AVAILABLE:
 # Initialize in-memory storage for results
 SUBDIVISION_RESULTS = []
 
+# Parcel saves to the Node.js backend kept in flight at once per subdivision request
+PARCEL_SAVE_CONCURRENCY = int(os.getenv("PARCEL_SAVE_CONCURRENCY", "32"))
+
 class CustomJSONEncoder(json.JSONEncoder):
     """Custom JSON encoder to handle Shapely geometries and other non-serializable objects"""
     def default(self, obj):
@@ -7163,43 +7323,38 @@ def calculate_polygon_area(polygon_coords):
     Handles both geographic coordinates (lat/lon) and projected coordinates (meters)
     """
     try:
-        from shapely.geometry import Polygon
         from pyproj import Geod
-        import numpy as np
         
-        # Convert coordinates to numpy array
-        coords = np.array(polygon_coords)
+        # Convert coordinates to a float64 numpy array
+        coords = np.asarray(polygon_coords, dtype=np.float64)
+        
+        # Create Shapely polygon straight from the coordinate array
+        poly = shapely.polygons(coords)
         
         # Check if coordinates are in geographic format (lat/lon degrees)
         # Geographic coordinates typically range: lon [-180, 180], lat [-90, 90]
-        lon_range = np.max(coords[:, 0]) - np.min(coords[:, 0])
-        lat_range = np.max(coords[:, 1]) - np.min(coords[:, 1])
+        min_lon, min_lat, max_lon, max_lat = shapely.bounds(poly)
+        lon_range, lat_range = max_lon - min_lon, max_lat - min_lat
         
         if lon_range < 10 and lat_range < 10:  # Likely geographic coordinates
             logger.info("🌍 Detected geographic coordinates (lat/lon), calculating geodesic area")
             
-            # Create Shapely polygon
-            poly = Polygon(coords)
-            
             # Use geodesic calculation for accurate area on Earth's surface
             geod = Geod(ellps='WGS84')
             area_sqm, _ = geod.geometry_area_perimeter(poly)
             area_sqm = abs(area_sqm)  # Area should be positive
             
-            logger.info(f"🌍 Geodesic area calculation: {area_sqm:.0f} sqm")
+            logger.info("🌍 Geodesic area calculation: %.0f sqm", area_sqm)
         else:
             logger.info("📐 Detected projected coordinates (meters), using planar area")
             
-            # Create Shapely polygon
-            poly = Polygon(coords)
-            
             # Calculate area (assuming coordinates are in meters)
-            area_sqm = poly.area
+            area_sqm = float(shapely.area(poly))
         
         # Convert to acres for better understanding
         area_acres = area_sqm / 4046.86
         
-        logger.info(f"📐 Polygon area: {area_sqm:.0f} sqm ({area_acres:.2f} acres)")
+        logger.info("📐 Polygon area: %.0f sqm (%.2f acres)", area_sqm, area_acres)
         
         return area_sqm, area_acres
     except Exception as e:
@@ -7215,9 +7370,6 @@ def draw_professional_road_network(ax, num_blocks_x, num_blocks_y, block_width,
     - Roundabouts and intersections
     - Proper road labeling system
     """
-    import numpy as np
-    import matplotlib.patches as patches
-    
     def apply_clip(artists):
         if clip_path is None:
             return
@@ -7243,26 +7395,35 @@ def draw_professional_road_network(ax, num_blocks_x, num_blocks_y, block_width,
     main_horizontal_spacing = max(2, num_blocks_y // 3)
     main_vertical_spacing = max(2, num_blocks_x // 3)
     
+    # Main roads share the same gentle curve, so sample it once per direction
+    curve_amplitude = road_width * 0.1
+    x_points = np.linspace(0, num_blocks_x * block_width, 200)
+    sin_x = curve_amplitude * np.sin(x_points * 0.2)
+    y_points = np.linspace(start_y, start_y + num_blocks_y * block_height, 200)
+    sin_y = curve_amplitude * np.sin(y_points * 0.2)
+    
+    # Bound once: the road and label loops below call these per iteration
+    plot = ax.plot
+    text = ax.text
+    
     # Horizontal main roads
     for i, row in enumerate(range(0, num_blocks_y + 1, main_horizontal_spacing)):
         y_pos = start_y + row * block_height
         
         # Create main road with slight curve
-        x_points = np.linspace(0, num_blocks_x * block_width, 200)
-        curve_amplitude = road_width * 0.1
-        y_curve = y_pos + curve_amplitude * np.sin(x_points * 0.2)
+        y_curve = y_pos + sin_x
         
         # Draw main road
-        main_line = ax.plot(x_points, y_curve, color='#4b5563', linewidth=main_road_width, alpha=0.9, solid_capstyle='round')
+        main_line = plot(x_points, y_curve, color='#4b5563', linewidth=main_road_width, alpha=0.9, solid_capstyle='round')
         apply_clip(main_line)
         
         # Add center line
-        center_line = ax.plot(x_points, y_curve, color='white', linewidth=3, alpha=0.9, solid_capstyle='round')
+        center_line = plot(x_points, y_curve, color='white', linewidth=3, alpha=0.9, solid_capstyle='round')
         apply_clip(center_line)
         
         # Add road label
         road_name = main_road_names[i % len(main_road_names)]
-        ax.text(num_blocks_x * block_width / 2, y_pos + road_width * 0.5, road_name,
+        text(num_blocks_x * block_width / 2, y_pos + road_width * 0.5, road_name,
                ha='center', va='center', fontsize=8, fontweight='bold', 
                color='white', bbox=dict(boxstyle="round,pad=0.2", facecolor='black', alpha=0.7))
     
@@ -7271,38 +7432,37 @@ def draw_professional_road_network(ax, num_blocks_x, num_blocks_y, block_width,
         x_pos = col * block_width
         
         # Create main road with slight curve
-        y_points = np.linspace(start_y, start_y + num_blocks_y * block_height, 200)
-        curve_amplitude = road_width * 0.1
-        x_curve = x_pos + curve_amplitude * np.sin(y_points * 0.2)
+        x_curve = x_pos + sin_y
         
         # Draw main road
-        main_line = ax.plot(x_curve, y_points, color='#4b5563', linewidth=main_road_width, alpha=0.9, solid_capstyle='round')
+        main_line = plot(x_curve, y_points, color='#4b5563', linewidth=main_road_width, alpha=0.9, solid_capstyle='round')
         apply_clip(main_line)
         
         # Add center line
-        center_line = ax.plot(x_curve, y_points, color='white', linewidth=3, alpha=0.9, solid_capstyle='round')
+        center_line = plot(x_curve, y_points, color='white', linewidth=3, alpha=0.9, solid_capstyle='round')
         apply_clip(center_line)
         
         # Add road label (rotated)
         road_name = main_road_names[i % len(main_road_names)]
-        ax.text(x_pos + road_width * 0.5, start_y + num_blocks_y * block_height / 2, road_name,
+        text(x_pos + road_width * 0.5, start_y + num_blocks_y * block_height / 2, road_name,
                ha='center', va='center', fontsize=8, fontweight='bold', rotation=90,
                color='white', bbox=dict(boxstyle="round,pad=0.2", facecolor='black', alpha=0.7))
     
     # SECONDARY COLLECTOR ROADS (Connect blocks within areas)
+    # Straight roads only need their two endpoints
+    secondary_segments = []
+    
     # Horizontal secondary roads
     for i, row in enumerate(range(1, num_blocks_y)):
         if row % main_horizontal_spacing != 0:
             y_pos = start_y + row * block_height
             
             # Create secondary road
-            x_points = np.linspace(0, num_blocks_x * block_width, 100)
-            secondary_line = ax.plot(x_points, [y_pos] * len(x_points), color='#6b7280', linewidth=secondary_width, alpha=0.8, solid_capstyle='round')
-            apply_clip(secondary_line)
+            secondary_segments.append(((0, y_pos), (num_blocks_x * block_width, y_pos)))
             
             # Add road label
             road_name = secondary_road_names[i % len(secondary_road_names)]
-            ax.text(num_blocks_x * block_width / 2, y_pos + road_width * 0.3, road_name,
+            text(num_blocks_x * block_width / 2, y_pos + road_width * 0.3, road_name,
                    ha='center', va='center', fontsize=6, fontweight='bold', 
                    color='white', bbox=dict(boxstyle="round,pad=0.1", facecolor='#374151', alpha=0.8))
     
@@ -7312,88 +7472,115 @@ def draw_professional_road_network(ax, num_blocks_x, num_blocks_y, block_width,
             x_pos = col * block_width
             
             # Create secondary road
-            y_points = np.linspace(start_y, start_y + num_blocks_y * block_height, 100)
-            secondary_line = ax.plot([x_pos] * len(y_points), y_points, color='#6b7280', linewidth=secondary_width, alpha=0.8, solid_capstyle='round')
-            apply_clip(secondary_line)
+            secondary_segments.append(((x_pos, start_y), (x_pos, start_y + num_blocks_y * block_height)))
             
             # Add road label (rotated)
             road_name = secondary_road_names[i % len(secondary_road_names)]
-            ax.text(x_pos + road_width * 0.3, start_y + num_blocks_y * block_height / 2, road_name,
+            text(x_pos + road_width * 0.3, start_y + num_blocks_y * block_height / 2, road_name,
                    ha='center', va='center', fontsize=6, fontweight='bold', rotation=90,
                    color='white', bbox=dict(boxstyle="round,pad=0.1", facecolor='#374151', alpha=0.8))
     
+    if secondary_segments:
+        secondary_lines = LineCollection(secondary_segments, colors='#6b7280', linewidths=secondary_width, alpha=0.8, capstyle='round')
+        ax.add_collection(secondary_lines)
+        apply_clip(secondary_lines)
+    
+    # Block origins for every (row, col), flattened row-major
+    block_rows, block_cols = np.meshgrid(np.arange(num_blocks_y), np.arange(num_blocks_x), indexing='ij')
+    block_rows = block_rows.ravel()
+    block_cols = block_cols.ravel()
+    block_xs = block_cols * block_width
+    block_ys = start_y + block_rows * block_height
+    
     # LOCAL ACCESS ROADS (Connect individual blocks)
-    for row in range(num_blocks_y):
-        for col in range(num_blocks_x):
-            block_x = col * block_width
-            block_y = start_y + row * block_height
-            
-            # Local roads around each block
-            if row % main_horizontal_spacing != 0 and col % main_vertical_spacing != 0:
-                # Horizontal local road
-                x_points = np.linspace(block_x, block_x + block_width, 50)
-                local_line = ax.plot(x_points, [block_y] * len(x_points), color='#9ca3af', linewidth=local_width, alpha=0.7, solid_capstyle='round')
-                apply_clip(local_line)
-                
-                # Vertical local road
-                y_points = np.linspace(block_y, block_y + block_height, 50)
-                local_line = ax.plot([block_x] * len(y_points), y_points, color='#9ca3af', linewidth=local_width, alpha=0.7, solid_capstyle='round')
-                apply_clip(local_line)
+    # One horizontal and one vertical segment per block, off the main-road grid
+    local_mask = (block_rows % main_horizontal_spacing != 0) & (block_cols % main_vertical_spacing != 0)
+    local_x = block_xs[local_mask]
+    local_y = block_ys[local_mask]
+    segs_local = np.empty((local_x.size, 2, 2, 2))
+    segs_local[:, 0, 0] = np.column_stack((local_x, local_y))
+    segs_local[:, 0, 1] = np.column_stack((local_x + block_width, local_y))
+    segs_local[:, 1, 0] = np.column_stack((local_x, local_y))
+    segs_local[:, 1, 1] = np.column_stack((local_x, local_y + block_height))
+    if segs_local.size:
+        local_lines = LineCollection(segs_local.reshape(-1, 2, 2), colors='#9ca3af', linewidths=local_width, alpha=0.7, capstyle='round')
+        ax.add_collection(local_lines)
+        apply_clip(local_lines)
     
     # PLOT ACCESS ROADS (Very narrow roads for plot access)
-    for row in range(num_blocks_y):
-        for col in range(num_blocks_x):
-            block_x = col * block_width
-            block_y = start_y + row * block_height
-            
-            # Plot access roads within blocks
-            # Horizontal plot access
-            for i in range(1, 4):
-                y_pos = block_y + (block_height * i / 4)
-                x_points = np.linspace(block_x + block_width * 0.1, block_x + block_width * 0.9, 30)
-                plot_line = ax.plot(x_points, [y_pos] * len(x_points), color='#d1d5db', linewidth=plot_width, alpha=0.6, solid_capstyle='round')
-                apply_clip(plot_line)
-            
-            # Vertical plot access
-            for i in range(1, 4):
-                x_pos = block_x + (block_width * i / 4)
-                y_points = np.linspace(block_y + block_height * 0.1, block_y + block_height * 0.9, 30)
-                plot_line = ax.plot([x_pos] * len(y_points), y_points, color='#d1d5db', linewidth=plot_width, alpha=0.6, solid_capstyle='round')
-                apply_clip(plot_line)
+    # Three horizontal then three vertical segments inside every block
+    quarters = np.arange(1, 4) / 4
+    segs_plot = np.empty((block_xs.size, 6, 2, 2))
+    segs_plot[:, :3, 0, 0] = (block_xs + block_width * 0.1)[:, None]
+    segs_plot[:, :3, 1, 0] = (block_xs + block_width * 0.9)[:, None]
+    segs_plot[:, :3, :, 1] = (block_ys[:, None] + block_height * quarters)[:, :, None]
+    segs_plot[:, 3:, :, 0] = (block_xs[:, None] + block_width * quarters)[:, :, None]
+    segs_plot[:, 3:, 0, 1] = (block_ys + block_height * 0.1)[:, None]
+    segs_plot[:, 3:, 1, 1] = (block_ys + block_height * 0.9)[:, None]
+    if segs_plot.size:
+        # Thin filler layer: rasterize it so vector backends (SVG/PDF) emit one image instead of thousands of paths
+        plot_lines = LineCollection(segs_plot.reshape(-1, 2, 2), colors='#d1d5db', linewidths=plot_width, alpha=0.6, capstyle='round', rasterized=True)
+        ax.add_collection(plot_lines)
+        apply_clip(plot_lines)
+    
+    # Main-road crossings, row-major
+    main_rows, main_cols = np.meshgrid(
+        np.arange(0, num_blocks_y + 1, main_horizontal_spacing),
+        np.arange(0, num_blocks_x + 1, main_vertical_spacing),
+        indexing='ij'
+    )
+    main_rows = main_rows.ravel()
+    main_cols = main_cols.ravel()
+    crossing_centers = np.column_stack((main_cols * block_width, start_y + main_rows * block_height))
     
     # ROUNDABOUTS (Add at major intersections)
     roundabout_radius = road_width * 8
-    for row in range(0, num_blocks_y + 1, main_horizontal_spacing):
-        for col in range(0, num_blocks_x + 1, main_vertical_spacing):
-            if row < num_blocks_y and col < num_blocks_x:
-                x_pos = col * block_width
-                y_pos = start_y + row * block_height
-                
-                # Create roundabout
-                roundabout = patches.Circle((x_pos, y_pos), roundabout_radius, 
-                                          facecolor='#10b981', edgecolor='#059669', 
-                                          linewidth=2, alpha=0.8)
-                ax.add_patch(roundabout)
-                apply_clip(roundabout)
-                
-                # Add roundabout label
-                ax.text(x_pos, y_pos, 'ROUNDABOUT', ha='center', va='center', 
-                       fontsize=6, fontweight='bold', color='white')
+    roundabout_centers = crossing_centers[(main_rows < num_blocks_y) & (main_cols < num_blocks_x)]
+    if len(roundabout_centers):
+        roundabouts = EllipseCollection(
+            widths=2 * roundabout_radius, heights=2 * roundabout_radius, angles=0,
+            units='xy', offsets=roundabout_centers, offset_transform=ax.transData,
+            facecolors='#10b981', edgecolors='#059669', linewidths=2, alpha=0.8
+        )
+        ax.add_collection(roundabouts)
+        apply_clip(roundabouts)
+        
+        # Add roundabout labels
+        for x_pos, y_pos in roundabout_centers:
+            text(x_pos, y_pos, 'ROUNDABOUT', ha='center', va='center', 
+                   fontsize=6, fontweight='bold', color='white')
     
     # INTERSECTIONS (Add intersection markings)
-    for row in range(0, num_blocks_y + 1, main_horizontal_spacing):
-        for col in range(0, num_blocks_x + 1, main_vertical_spacing):
-            x_pos = col * block_width
-            y_pos = start_y + row * block_height
-            
-            # Add intersection square
-            intersection_size = road_width * 3
-            intersection = patches.Rectangle((x_pos - intersection_size/2, y_pos - intersection_size/2), 
-                                           intersection_size, intersection_size,
-                                           facecolor='#fbbf24', edgecolor='#f59e0b', 
-                                           linewidth=1, alpha=0.9)
-            ax.add_patch(intersection)
-            apply_clip(intersection)
+    intersection_size = road_width * 3
+    square_corners = np.array([[-0.5, -0.5], [0.5, -0.5], [0.5, 0.5], [-0.5, 0.5]]) * intersection_size
+    intersections = PolyCollection(
+        crossing_centers[:, None, :] + square_corners,
+        facecolors='#fbbf24', edgecolors='#f59e0b', linewidths=1, alpha=0.9
+    )
+    ax.add_collection(intersections)
+    apply_clip(intersections)
+
+# Below this many pairs per worker, thread start-up costs more than GEOS saves
+PARALLEL_INTERSECTION_MIN_CHUNK = 512
+
+def _parallel_intersection(geoms_a, geoms_b):
+    """
+    Element-wise shapely.intersection split into chunks across threads.
+    GEOS releases the GIL, so large batches scale with cores; small batches run inline.
+    """
+    total = len(geoms_a)
+    workers = min(os.cpu_count() or 1, total // PARALLEL_INTERSECTION_MIN_CHUNK)
+    if workers <= 1:
+        return shapely.intersection(geoms_a, geoms_b)
+
+    edges = np.linspace(0, total, workers + 1, dtype=int)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        chunks = executor.map(
+            lambda lo, hi: shapely.intersection(geoms_a[lo:hi], geoms_b[lo:hi]),
+            edges[:-1],
+            edges[1:],
+        )
+        return np.concatenate(list(chunks))
 
 def _iter_line_geometries(geometry):
     """
@@ -7401,16 +7588,16 @@ def _iter_line_geometries(geometry):
     """
     if geometry is None or geometry.is_empty:
         return
-    if isinstance(geometry, (LineString, LinearRing)):
+    type_id = shapely.get_type_id(geometry)
+    if type_id in (1, 2):  # LineString, LinearRing
         yield geometry
         return
-    if isinstance(geometry, MultiLineString):
-        for line in geometry.geoms:
-            if not line.is_empty:
-                yield line
+    if type_id == 5:  # MultiLineString: every part is already a line
+        parts = shapely.get_parts(geometry)
+        yield from parts[~shapely.is_empty(parts)]
         return
-    if hasattr(geometry, "geoms"):
-        for geom_part in geometry.geoms:
+    if type_id in (4, 6, 7):  # MultiPoint, MultiPolygon, GeometryCollection
+        for geom_part in shapely.get_parts(geometry):
             yield from _iter_line_geometries(geom_part)
 
 def draw_voronoi_road_network(ax, block_polygons, block_types, layout_polygon, base_road_width, clip_path=None):
@@ -7436,21 +7623,17 @@ def draw_voronoi_road_network(ax, block_polygons, block_types, layout_polygon, b
             if artist is not None:
                 artist.set_clip_path(clip_path)
 
+    # Lines are collected per style and emitted as one LineCollection each
+    segments_by_style = {}
+    column_stack = np.column_stack
+
     def draw_line(line_geom, width, color, alpha=0.95, zorder=2, style="-"):
         if line_geom.is_empty:
             return
-        x, y = line_geom.xy
-        line_artist = ax.plot(
-            x,
-            y,
-            linestyle=style,
-            color=color,
-            linewidth=width,
-            alpha=alpha,
-            solid_capstyle="round",
-            zorder=zorder,
-        )
-        apply_clip(line_artist)
+        key = (round(width, 3), color, alpha, zorder, style)
+        segments = segments_by_style.setdefault(key, [])
+        for part in _iter_line_geometries(line_geom):
+            segments.append(column_stack(part.xy))
 
     # 1) Draw an arterial ring along the polygon boundary (boulevard feel)
     boundary = layout_polygon.boundary
@@ -7458,66 +7641,79 @@ def draw_voronoi_road_network(ax, block_polygons, block_types, layout_polygon, b
         draw_line(boundary_part, arterial_width * 1.1, "#1f2937", alpha=0.85)
 
     # 2) Draw shared-boundary streets between adjacent Voronoi cells
-    total_blocks = len(block_polygons)
-    for i in range(total_blocks):
-        geom_i = block_polygons[i]
-        type_i = block_types[i] if i < len(block_types) else "residential"
-        if geom_i.is_empty:
+    # An STRtree prunes the cell pairs to those that actually meet; the
+    # surviving boundaries are intersected in one vectorized call.
+    polys_arr = np.asarray(block_polygons, dtype=object)
+    nonempty = ~shapely.is_empty(polys_arr)
+    # Land-use per block, padded so every index has a type
+    type_arr = list(block_types[:len(block_polygons)])
+    type_arr += ["residential"] * (len(block_polygons) - len(type_arr))
+
+    pair_i, pair_j = shapely.STRtree(polys_arr).query(polys_arr, predicate="intersects")
+    keep = pair_i < pair_j
+    pair_i, pair_j = pair_i[keep], pair_j[keep]
+    order = np.lexsort((pair_j, pair_i))
+    pair_i, pair_j = pair_i[order], pair_j[order]
+
+    boundaries = shapely.boundary(polys_arr)
+    shared_boundaries = _parallel_intersection(boundaries[pair_i], boundaries[pair_j])
+
+    for i, j, shared in zip(pair_i, pair_j, shared_boundaries):
+        if shared is None or shared.is_empty:
             continue
+        type_i = type_arr[i]
+        type_j = type_arr[j]
 
-        for j in range(i + 1, total_blocks):
-            geom_j = block_polygons[j]
-            type_j = block_types[j] if j < len(block_types) else "residential"
-            if geom_j.is_empty:
-                continue
-
-            shared = geom_i.boundary.intersection(geom_j.boundary)
-            if shared.is_empty:
-                continue
-
-            segments = list(_iter_line_geometries(shared))
-            if not segments:
-                continue
+        # Flatten (possibly nested) collections and keep the non-empty line parts
+        parts = shapely.get_parts(shapely.get_parts(shared))
+        segments = parts[
+            np.isin(shapely.get_type_id(parts), (1, 2)) & ~shapely.is_empty(parts)
+        ]
+        if segments.size == 0:
+            continue
 
-            total_length = sum(seg.length for seg in segments)
-            if total_length < min_length_threshold:
-                continue
+        total_length = shapely.length(segments).sum()
+        if total_length < min_length_threshold:
+            continue
 
-            pair_types = {type_i, type_j}
-            if "commercial" in pair_types:
-                width = collector_width
-                color = "#4b5563"
-            elif pair_types == {"park"}:
-                width = walkway_width
-                color = "#6b7280"
-            elif "park" in pair_types:
-                width = collector_width * 0.7
-                color = "#6b7280"
-            else:
-                width = local_width
-                color = "#9ca3af"
+        pair_types = {type_i, type_j}
+        if "commercial" in pair_types:
+            width = collector_width
+            color = "#4b5563"
+        elif pair_types == {"park"}:
+            width = walkway_width
+            color = "#6b7280"
+        elif "park" in pair_types:
+            width = collector_width * 0.7
+            color = "#6b7280"
+        else:
+            width = local_width
+            color = "#9ca3af"
 
-            for segment in segments:
-                draw_line(segment, width, color)
+        for segment in segments:
+            draw_line(segment, width, color)
 
     # 3) Add centroid connectors to mimic secondary corridors
-    centroids = []
-    for geom in block_polygons:
-        if geom.is_empty:
-            continue
-        centroids.append(geom.centroid)
+    centroids = list(shapely.centroid(polys_arr[nonempty]))
+
+    # Nearest two neighbours of every centroid via a KD-tree (self + 2)
+    neighbor_lists = []
+    if len(centroids) > 1:
+        centroid_tree = cKDTree(np.array([[pt.x, pt.y] for pt in centroids]))
+        _, neighbor_idxs = centroid_tree.query(
+            centroid_tree.data, k=min(3, len(centroids))
+        )
+        for idx, neighbors in enumerate(neighbor_idxs):
+            neighbor_lists.append([int(nb) for nb in neighbors if nb != idx][:2])
 
+    # Undirected pairs packed into one int key: (low << 32) | high
     added_pairs = set()
-    for idx, origin in enumerate(centroids):
-        distances = []
-        for jdx, dest in enumerate(centroids):
-            if idx == jdx:
-                continue
-            distances.append((origin.distance(dest), jdx))
-        distances.sort(key=lambda d: d[0])
-
-        for _, neighbor_idx in distances[:2]:
-            pair = tuple(sorted((idx, neighbor_idx)))
+    for idx, neighbors in enumerate(neighbor_lists):
+        for neighbor_idx in neighbors:
+            if idx < neighbor_idx:
+                pair = (idx << 32) | neighbor_idx
+            else:
+                pair = (neighbor_idx << 32) | idx
             if pair in added_pairs:
                 continue
             added_pairs.add(pair)
@@ -7529,36 +7725,61 @@ def draw_voronoi_road_network(ax, block_polygons, block_types, layout_polygon, b
 
             draw_line(corridor, collector_width * 0.6, "#475569", alpha=0.6, zorder=1)
 
+    for (width, color, alpha, zorder, style), segments in segments_by_style.items():
+        line_collection = LineCollection(
+            segments,
+            colors=color,
+            linewidths=width,
+            linestyles=style,
+            alpha=alpha,
+            zorder=zorder,
+            capstyle="round",
+        )
+        ax.add_collection(line_collection)
+        apply_clip(line_collection)
+
     # 4) Sprinkle roundabout markers on major centroid hubs
     try:
-        import numpy as np
-
-        centroid_points = np.array([[pt.x, pt.y] for pt in centroids])
+        centroid_points = shapely.get_coordinates(centroids)
         if centroid_points.size == 0:
             return
 
         mean_point = centroid_points.mean(axis=0)
         distances_from_mean = np.linalg.norm(centroid_points - mean_point, axis=1)
-        hub_indices = distances_from_mean.argsort()[: max(1, len(centroids) // 8)]
+        # Only the k closest hubs are needed, not a full sort
+        hub_count = max(1, len(centroids) // 8)
+        hub_indices = np.argpartition(distances_from_mean, hub_count - 1)[:hub_count]
 
-        for idx in hub_indices:
-            hub = centroids[idx]
-            if not layout_polygon.contains(hub):
-                continue
-            roundabout = plt.Circle(
-                (hub.x, hub.y),
-                base_road_width * 3.2,
-                facecolor="#0ea5e9",
-                edgecolor="#0369a1",
-                linewidth=1.5,
-                alpha=0.85,
-                zorder=3,
-            )
-            ax.add_patch(roundabout)
-            apply_clip(roundabout)
-            ax.text(
-                hub.x,
-                hub.y,
+        # Point-in-polygon for all candidate hubs in one GEOS call
+        hub_points = centroid_points[hub_indices]
+        hubs_inside = shapely.contains_xy(layout_polygon, hub_points[:, 0], hub_points[:, 1])
+
+        hub_points = hub_points[hubs_inside]
+        if len(hub_points) == 0:
+            return
+
+        hub_diameter = base_road_width * 3.2 * 2
+        roundabouts = EllipseCollection(
+            widths=hub_diameter,
+            heights=hub_diameter,
+            angles=0,
+            units="xy",
+            offsets=hub_points,
+            offset_transform=ax.transData,
+            facecolors="#0ea5e9",
+            edgecolors="#0369a1",
+            linewidths=1.5,
+            alpha=0.85,
+            zorder=3,
+        )
+        ax.add_collection(roundabouts)
+        apply_clip(roundabouts)
+
+        text = ax.text
+        for hub_x, hub_y in hub_points:
+            text(
+                hub_x,
+                hub_y,
                 "R",
                 ha="center",
                 va="center",
@@ -7598,35 +7819,58 @@ def draw_rectilinear_road_network(ax, min_x, max_x, start_y, height, num_blocks_
     centerline_color = "#ffffff"  # White centerlines
     width = max_x - min_x
 
-    # Horizontal roads
-    for row in range(num_blocks_y + 1):
-        y = start_y + row * block_height
-        road_width, label_ft = road_style(row, num_blocks_y)
-        rect = patches.Rectangle(
-            (min_x, y - road_width / 2),
-            width,
-            road_width,
-            facecolor=road_color,
-            edgecolor=border_color,
-            linewidth=1.2,
-            alpha=0.95,
-            zorder=2,
-        )
-        ax.add_patch(rect)
-        apply_clip(rect)
-        # White centerline
-        centerline = patches.Rectangle(
-            (min_x, y - road_width * 0.15),
-            width,
-            road_width * 0.3,
-            facecolor=centerline_color,
-            edgecolor='none',
-            alpha=0.9,
-            zorder=2.5,
+    def rect_verts(x0, y0, w, h):
+        """Corner array of shape (N, 4, 2) for axis-aligned rectangles."""
+        x0, y0, w, h = np.broadcast_arrays(x0, y0, w, h)
+        return np.stack(
+            [
+                np.column_stack((x0, y0)),
+                np.column_stack((x0 + w, y0)),
+                np.column_stack((x0 + w, y0 + h)),
+                np.column_stack((x0, y0 + h)),
+            ],
+            axis=1,
         )
-        ax.add_patch(centerline)
-        apply_clip(centerline)
-        # Road labels at fixed intervals (every 3rd road or major roads)
+
+    h_styles = [road_style(row, num_blocks_y) for row in range(num_blocks_y + 1)]
+    v_styles = [road_style(col, num_blocks_x) for col in range(num_blocks_x + 1)]
+    h_widths = np.array([style[0] for style in h_styles])
+    v_widths = np.array([style[0] for style in v_styles])
+    ys = start_y + np.arange(num_blocks_y + 1) * block_height
+    xs = min_x + np.arange(num_blocks_x + 1) * block_width
+
+    # Road surfaces (horizontal then vertical) and their white centerlines,
+    # one collection each
+    road_verts = np.concatenate([
+        rect_verts(min_x, ys - h_widths / 2, width, h_widths),
+        rect_verts(xs - v_widths / 2, start_y, v_widths, height),
+    ])
+    centerline_verts = np.concatenate([
+        rect_verts(min_x, ys - h_widths * 0.15, width, h_widths * 0.3),
+        rect_verts(xs - v_widths * 0.15, start_y, v_widths * 0.3, height),
+    ])
+    roads = PolyCollection(
+        road_verts,
+        facecolors=road_color,
+        edgecolors=border_color,
+        linewidths=1.2,
+        alpha=0.95,
+        zorder=2,
+    )
+    ax.add_collection(roads)
+    apply_clip(roads)
+    centerlines = PolyCollection(
+        centerline_verts,
+        facecolors=centerline_color,
+        edgecolors='none',
+        alpha=0.9,
+        zorder=2.5,
+    )
+    ax.add_collection(centerlines)
+    apply_clip(centerlines)
+
+    # Road labels at fixed intervals (every 3rd road or major roads)
+    for row, (y, (road_width, label_ft)) in enumerate(zip(ys, h_styles)):
         if row in (0, num_blocks_y, num_blocks_y // 2) or (row % 3 == 0 and num_blocks_y >= 6):
             ax.text(
                 min_x + width / 2,
@@ -7641,35 +7885,7 @@ def draw_rectilinear_road_network(ax, min_x, max_x, start_y, height, num_blocks_
                 bbox=dict(boxstyle="round,pad=0.15", facecolor="#eef2ff", edgecolor="#94a3b8", linewidth=1),
             )
 
-    # Vertical roads
-    for col in range(num_blocks_x + 1):
-        x = min_x + col * block_width
-        road_width, label_ft = road_style(col, num_blocks_x)
-        rect = patches.Rectangle(
-            (x - road_width / 2, start_y),
-            road_width,
-            height,
-            facecolor=road_color,
-            edgecolor=border_color,
-            linewidth=1.2,
-            alpha=0.95,
-            zorder=2,
-        )
-        ax.add_patch(rect)
-        apply_clip(rect)
-        # White centerline
-        centerline = patches.Rectangle(
-            (x - road_width * 0.15, start_y),
-            road_width * 0.3,
-            height,
-            facecolor="#ffffff",
-            edgecolor='none',
-            alpha=0.9,
-            zorder=2.5,
-        )
-        ax.add_patch(centerline)
-        apply_clip(centerline)
-        # Road labels at fixed intervals (every 3rd road or major roads)
+    for col, (x, (road_width, label_ft)) in enumerate(zip(xs, v_styles)):
         if col in (0, num_blocks_x, num_blocks_x // 2) or (col % 3 == 0 and num_blocks_x >= 6):
             ax.text(
                 x,
@@ -7825,6 +8041,12 @@ def draw_curved_neighborhood_spines(ax, min_x, max_x, start_y, height, base_road
         if clip_path is not None:
             centerline.set_clip_path(clip_path)
 
+_MARLA_RE = re.compile(r'(\d+(?:\.\d+)?)\s*MARLA', re.IGNORECASE)
+# Marla value of every CDA standard plot size label; other labels go through _MARLA_RE
+_MARLA_BY_LABEL = {'5 MARLA': 5.0, '7 MARLA': 7.0, '15 MARLA': 15.0, '20 MARLA': 20.0}
+# Blocks below the smallest CDA plot size cannot be subdivided into plots
+_MIN_PLOT_MARLA = min(_MARLA_BY_LABEL.values())
+
 def determine_plot_grid(render_geom, block_type, area_acres=None, total_blocks=None, plot_size_str=None):
     """
     Determine plot grid size based on actual area and plot size to match total marla.
@@ -7833,13 +8055,17 @@ def determine_plot_grid(render_geom, block_type, area_acres=None, total_blocks=N
     min_bx, min_by, max_bx, max_by = render_geom.bounds
     width = max(max_bx - min_bx, 1e-3)
     height = max(max_by - min_by, 1e-3)
-    aspect = width / height
     
+    # The grid only depends on the block's aspect ratio and the scalar inputs,
+    # so identical block shapes across a plan reuse the cached answer
+    return _determine_plot_grid_cached(width / height, block_type, area_acres, total_blocks, plot_size_str)
+
+@functools.lru_cache(maxsize=1024)
+def _determine_plot_grid_cached(aspect, block_type, area_acres, total_blocks, plot_size_str):
     # Extract marla from plot_size_str if provided (e.g., "5 MARLA" -> 5)
     plot_marla = None
     if plot_size_str:
-        import re
-        match = re.search(r'(\d+(?:\.\d+)?)\s*MARLA', str(plot_size_str).upper())
+        match = _MARLA_RE.search(str(plot_size_str))
         if match:
             plot_marla = float(match.group(1))
     
@@ -7933,40 +8159,61 @@ def determine_plot_grid(render_geom, block_type, area_acres=None, total_blocks=N
     
     return rows, cols
 
-def create_park_within_block(block_geom, park_ratio=0.15):
+def _fit_plot_grid(rows, cols, target_count, wide, min_rows):
     """
-    Create a park area within a residential block.
-    Returns the park geometry and the remaining block geometry for plots.
-    park_ratio: fraction of block area to reserve for park (default 15%)
+    Nudge a rows x cols plot grid towards target_count plots.
+    Grows the long side of the block (capped at 20 once the other side reaches 20),
+    or shrinks whichever side is larger, never going below min_rows rows or 1 column.
     """
-    if block_geom.is_empty:
-        return None, block_geom
+    if rows * cols < target_count:
+        if wide:
+            needed = -(-target_count // rows)
+            cols = max(cols, min(needed, 20) if rows >= 20 else needed)
+        else:
+            needed = -(-target_count // cols)
+            rows = max(rows, min(needed, 20) if cols >= 20 else needed)
+        return rows, cols
+    if rows * cols == target_count or rows <= min_rows or cols <= 1:
+        return rows, cols
+    
+    # Trim the larger side until the grid is (nearly) square
+    if rows > cols:
+        rows = max(cols, min_rows, target_count // cols)
+        if rows > cols:
+            return rows, cols
+    else:
+        cols = max(rows - 1, 1, target_count // rows)
+        if cols >= rows:
+            return rows, cols
     
-    min_bx, min_by, max_bx, max_by = block_geom.bounds
+    # Then shrink both sides alternately; with s = rows + cols the grid is ceil(s/2) x floor(s/2)
+    s = min(rows + cols, max(math.isqrt(4 * target_count + 3), 2 * min_rows, 3))
+    return (s + 1) // 2, s // 2
+
+def _is_axis_aligned_rectangle(geom):
+    """True when geom is a single hole-free polygon that fills its own bounding box."""
+    if shapely.get_type_id(geom) != 3 or shapely.get_num_interior_rings(geom) > 0:
+        return False
+    min_x, min_y, max_x, max_y = geom.bounds
+    box_area = (max_x - min_x) * (max_y - min_y)
+    return box_area > 0 and abs(geom.area - box_area) <= box_area * 1e-9
+
+# Park placements, indexed by the codes _park_box understands
+PARK_POSITIONS = ['center', 'corner', 'side']
+PARK_CORNERS = ['top-left', 'top-right', 'bottom-left', 'bottom-right']
+PARK_SIDES = ['top', 'bottom', 'left', 'right']
+
+def _park_box(min_bx, min_by, max_bx, max_by, park_area_target, position, placement):
+    """
+    Pure-float core of create_park_within_block.
+    position: 0=center, 1=corner, 2=side; placement indexes PARK_CORNERS / PARK_SIDES.
+    Returns (park_x0, park_y0, park_x1, park_y1).
+    """
     width = max(max_bx - min_bx, 1e-3)
     height = max(max_by - min_by, 1e-3)
-    
-    # Determine park position (center, corner, or side)
-    # Use block position as seed for deterministic placement
-    import random
     block_center_x = (min_bx + max_bx) / 2
     block_center_y = (min_by + max_by) / 2
     
-    # Park size: 15-25% of block area
-    park_area_target = block_geom.area * park_ratio
-    
-    # Try different park positions: center, corner, or side
-    park_positions = [
-        'center',  # Center of block
-        'corner',   # One corner
-        'side'      # One side
-    ]
-    
-    # Use block bounds as seed for deterministic placement
-    seed = int((min_bx + min_by) * 1000) % 10000
-    random.seed(seed)
-    park_position = random.choice(park_positions)
-    
     # Calculate park dimensions
     park_width = np.sqrt(park_area_target * (width / height))
     park_height = park_area_target / park_width if park_width > 0 else np.sqrt(park_area_target)
@@ -7976,25 +8223,23 @@ def create_park_within_block(block_geom, park_ratio=0.15):
     park_height = min(park_height, height * 0.4)
     
     # Position park based on selected position
-    if park_position == 'center':
+    if position == 0:  # center
         park_x0 = block_center_x - park_width / 2
         park_y0 = block_center_y - park_height / 2
         park_x1 = block_center_x + park_width / 2
         park_y1 = block_center_y + park_height / 2
-    elif park_position == 'corner':
-        # Place in one of the corners
-        corner = random.choice(['top-left', 'top-right', 'bottom-left', 'bottom-right'])
-        if corner == 'top-left':
+    elif position == 1:  # corner
+        if placement == 0:  # top-left
             park_x0 = min_bx + width * 0.05
             park_y0 = max_by - park_height - height * 0.05
             park_x1 = park_x0 + park_width
             park_y1 = max_by - height * 0.05
-        elif corner == 'top-right':
+        elif placement == 1:  # top-right
             park_x0 = max_bx - park_width - width * 0.05
             park_y0 = max_by - park_height - height * 0.05
             park_x1 = max_bx - width * 0.05
             park_y1 = max_by - height * 0.05
-        elif corner == 'bottom-left':
+        elif placement == 2:  # bottom-left
             park_x0 = min_bx + width * 0.05
             park_y0 = min_by + height * 0.05
             park_x1 = park_x0 + park_width
@@ -8005,19 +8250,17 @@ def create_park_within_block(block_geom, park_ratio=0.15):
             park_x1 = max_bx - width * 0.05
             park_y1 = min_by + park_height + height * 0.05
     else:  # side
-        # Place on one side
-        side = random.choice(['top', 'bottom', 'left', 'right'])
-        if side == 'top':
+        if placement == 0:  # top
             park_x0 = block_center_x - park_width / 2
             park_y0 = max_by - park_height - height * 0.05
             park_x1 = block_center_x + park_width / 2
             park_y1 = max_by - height * 0.05
-        elif side == 'bottom':
+        elif placement == 1:  # bottom
             park_x0 = block_center_x - park_width / 2
             park_y0 = min_by + height * 0.05
             park_x1 = block_center_x + park_width / 2
             park_y1 = min_by + park_height + height * 0.05
-        elif side == 'left':
+        elif placement == 2:  # left
             park_x0 = min_bx + width * 0.05
             park_y0 = block_center_y - park_height / 2
             park_x1 = park_x0 + park_width
@@ -8028,8 +8271,48 @@ def create_park_within_block(block_geom, park_ratio=0.15):
             park_x1 = max_bx - width * 0.05
             park_y1 = block_center_y + park_height / 2
     
+    return park_x0, park_y0, park_x1, park_y1
+
+def _largest_part(geometry):
+    """Largest-area member of a multi-part geometry, via one vectorized area call."""
+    parts = shapely.get_parts(geometry)
+    return parts[int(np.argmax(shapely.area(parts)))]
+
+def _park_placement(min_bx, min_by):
+    """
+    Pick the (position, placement) codes for a block's park.
+    Uses block position as seed for deterministic placement.
+    """
+    # A private generator leaves the module-level random state untouched
+    rng = random.Random(int((min_bx + min_by) * 1000) % 10000)
+    position = PARK_POSITIONS.index(rng.choice(PARK_POSITIONS))
+    if position == 1:
+        placement = PARK_CORNERS.index(rng.choice(PARK_CORNERS))
+    elif position == 2:
+        placement = PARK_SIDES.index(rng.choice(PARK_SIDES))
+    else:
+        placement = 0
+    return position, placement
+
+def create_park_within_block(block_geom, park_ratio=0.15):
+    """
+    Create a park area within a residential block.
+    Returns the park geometry and the remaining block geometry for plots.
+    park_ratio: fraction of block area to reserve for park (default 15%)
+    """
+    if block_geom.is_empty:
+        return None, block_geom
+    
+    min_bx, min_by, max_bx, max_by = block_geom.bounds
+    
+    # Park size: 15-25% of block area
+    park_area_target = block_geom.area * park_ratio
+    
+    # Determine park position (center, corner, or side)
+    position, placement = _park_placement(min_bx, min_by)
+    
     # Create park polygon
-    park_geom = box(park_x0, park_y0, park_x1, park_y1)
+    park_geom = box(*_park_box(min_bx, min_by, max_bx, max_by, park_area_target, position, placement))
     park_geom = block_geom.intersection(park_geom)
     
     if park_geom.is_empty or park_geom.area < block_geom.area * 0.05:
@@ -8041,74 +8324,121 @@ def create_park_within_block(block_geom, park_ratio=0.15):
     
     # If difference creates multiple polygons, use the largest one
     if hasattr(plot_area_geom, 'geoms'):
-        plot_area_geom = max(plot_area_geom.geoms, key=lambda g: g.area)
+        plot_area_geom = _largest_part(plot_area_geom)
     
     return park_geom, plot_area_geom
 
+# Upper bound on grid cells handled per vectorized batch in subdivide_block_into_plots
+SUBDIVIDE_TILE_CELLS = 4096
+
+def _rect_grid_cells(start_x, start_y, cell_w, cell_h, rows, cols, bounds, min_area):
+    """
+    Grid cells of a rectangular block, clipped to its bounds with min/max.
+    Returns (row-major indices of cells larger than min_area, (x0, y0, x1, y1) arrays for them).
+    """
+    min_bx, min_by, max_bx, max_by = bounds
+    r, c = np.divmod(np.arange(rows * cols), cols)
+    x0 = np.maximum(start_x + c * cell_w, min_bx)
+    y0 = np.maximum(start_y + r * cell_h, min_by)
+    x1 = np.minimum(start_x + (c + 1) * cell_w, max_bx)
+    y1 = np.minimum(start_y + (r + 1) * cell_h, max_by)
+    keep = np.flatnonzero((x1 > x0) & (y1 > y0) & ((x1 - x0) * (y1 - y0) > min_area))
+    return keep, (x0[keep], y0[keep], x1[keep], y1[keep])
+
 def subdivide_block_into_plots(block_geom, rows, cols, padding_ratio=0.01):
     """
     Subdivide block into plots exactly like Zameen maps - clear rectangular grid with numbered plots.
     """
-    min_bx, min_by, max_bx, max_by = block_geom.bounds
+    block_bounds = block_geom.bounds
+    min_bx, min_by, max_bx, max_by = block_bounds
+    is_rectangle = _is_axis_aligned_rectangle(block_geom)
     width = max(max_bx - min_bx, 1e-3)
     height = max(max_by - min_by, 1e-3)
     
-    # Minimal padding for clear separation between plots
-    pad_x = width * padding_ratio
-    pad_y = height * padding_ratio
-    
-    # Use almost full block area (98%) for plots
-    start_x = min_bx + pad_x
-    start_y = min_by + pad_y
-    usable_width = width - 2 * pad_x
-    usable_height = height - 2 * pad_y
-    
-    # Calculate cell dimensions
-    cell_w = usable_width / cols
-    cell_h = usable_height / rows
-    
-    plots = []
-    min_area_factor = min(0.001, 1.0 / max(rows * cols * 4, 1))
-    min_area = width * height * min_area_factor
-
-    for r in range(rows):
-        for c in range(cols):
-            # Create rectangular cell
-            cell_x0 = start_x + c * cell_w
-            cell_y0 = start_y + r * cell_h
-            cell_x1 = start_x + (c + 1) * cell_w
-            cell_y1 = start_y + (r + 1) * cell_h
-            
-            cell = box(cell_x0, cell_y0, cell_x1, cell_y1)
-            plot_geom = block_geom.intersection(cell)
-            
-            if not plot_geom.is_empty and plot_geom.area > min_area:
-                # Calculate plot number: left to right, top to bottom (like Zameen)
-                plot_number = r * cols + c + 1
-                plots.append((plot_number, plot_geom))
-    
-    # Sort by plot number to ensure proper sequential order
-    plots.sort(key=lambda x: x[0])
-    if plots:
-        return plots
-
-    if rows == 1 and cols == 1:
-        return [(1, block_geom)]
-
-    reduced_rows = max(1, rows // 2)
-    reduced_cols = max(1, cols // 2)
-    if reduced_rows == rows and rows > 1:
-        reduced_rows -= 1
-    if reduced_cols == cols and cols > 1:
-        reduced_cols -= 1
-    reduced_rows = max(1, reduced_rows)
-    reduced_cols = max(1, reduced_cols)
-
-    if reduced_rows == rows and reduced_cols == cols:
-        return [(1, block_geom)]
-
-    new_padding = min(padding_ratio * 1.2, 0.05)
-    return subdivide_block_into_plots(block_geom, reduced_rows, reduced_cols, new_padding)
+    # Shrink the grid (and grow the padding) until at least one plot survives
+    while True:
+        # Minimal padding for clear separation between plots
+        pad_x = width * padding_ratio
+        pad_y = height * padding_ratio
+        
+        # Use almost full block area (98%) for plots
+        start_x = min_bx + pad_x
+        start_y = min_by + pad_y
+        usable_width = width - 2 * pad_x
+        usable_height = height - 2 * pad_y
+        
+        # Calculate cell dimensions
+        cell_w = usable_width / cols
+        cell_h = usable_height / rows
+        
+        min_area_factor = min(0.001, 1.0 / max(rows * cols * 4, 1))
+        min_area = width * height * min_area_factor
+
+        if is_rectangle:
+            # Pure array math; only the surviving cells become geometries
+            keep, clipped = _rect_grid_cells(start_x, start_y, cell_w, cell_h, rows, cols, block_bounds, min_area)
+            plot_geoms = shapely.box(*clipped)
+        else:
+            # Cells are built in bands of whole rows (row-major) so very large grids
+            # work on bounded arrays against the prepared block
+            shapely.prepare(block_geom)
+            band_rows = max(1, SUBDIVIDE_TILE_CELLS // cols)
+            keep_parts = []
+            geom_parts = []
+            for band_start in range(0, rows, band_rows):
+                cell_idx = np.arange(band_start * cols, min(rows, band_start + band_rows) * cols)
+                r, c = np.divmod(cell_idx, cols)
+                cells = shapely.box(
+                    start_x + c * cell_w,
+                    start_y + r * cell_h,
+                    start_x + (c + 1) * cell_w,
+                    start_y + (r + 1) * cell_h,
+                )
+                # Cells strictly inside the block are their own intersection; only the
+                # boundary cells need a real GEOS overlay
+                boundary_cells = ~shapely.contains_properly(block_geom, cells)
+                band_geoms = cells.copy()
+                band_geoms[boundary_cells] = shapely.intersection(block_geom, cells[boundary_cells])
+                band_keep = ~shapely.is_empty(band_geoms) & (shapely.area(band_geoms) > min_area)
+                keep_parts.append(cell_idx[band_keep])
+                geom_parts.append(band_geoms[band_keep])
+            keep = np.concatenate(keep_parts)
+            plot_geoms = np.concatenate(geom_parts)
+        
+        # Plot number: left to right, top to bottom (like Zameen), already in sequential order
+        plots = [(int(idx) + 1, plot_geom) for idx, plot_geom in zip(keep, plot_geoms)]
+        if plots:
+            return plots
+
+        if rows == 1 and cols == 1:
+            return [(1, block_geom)]
+
+        reduced_rows = max(1, rows // 2)
+        reduced_cols = max(1, cols // 2)
+        if reduced_rows == rows and rows > 1:
+            reduced_rows -= 1
+        if reduced_cols == cols and cols > 1:
+            reduced_cols -= 1
+        reduced_rows = max(1, reduced_rows)
+        reduced_cols = max(1, reduced_cols)
+
+        if reduced_rows == rows and reduced_cols == cols:
+            return [(1, block_geom)]
+
+        rows, cols = reduced_rows, reduced_cols
+        padding_ratio = min(padding_ratio * 1.2, 0.05)
+
+# Small integer codes for block land uses (anything else maps to -1)
+BLOCK_TYPE_CODES = {'park': 0, 'commercial': 1, 'residential': 2}
+# Small integer codes for placed amenities (0 = no amenity)
+AMENITY_CODES = {"MOSQUE": 1, "HOSPITAL": 2, "SCHOOL": 3, "GRID STATION": 4}
+# Codes an amenity may not sit next to: its own type (CDA rule), and hospitals/schools keep apart
+AMENITY_CONFLICTS = {
+    "MOSQUE": (1,),
+    "HOSPITAL": (2, 3),
+    "SCHOOL": (3, 2),
+    "GRID STATION": (4,),
+}
 
 def generate_amenity_overlays(block_polygons, block_types, seed=0, max_overlays=8, area_acres=0, blocked_indices=None, num_blocks_x=None, num_blocks_y=None):
     """
@@ -8129,24 +8459,6 @@ def generate_amenity_overlays(block_polygons, block_types, seed=0, max_overlays=
         num_blocks_y = int(np.sqrt(total_blocks))
         num_blocks_x = (total_blocks + num_blocks_y - 1) // num_blocks_y
     
-    # Helper function to get adjacent block indices
-    def get_adjacent_indices(idx):
-        """Get indices of adjacent blocks (8-directional)."""
-        row = idx // num_blocks_x
-        col = idx % num_blocks_x
-        adjacent = []
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue
-                new_row = row + dr
-                new_col = col + dc
-                if 0 <= new_row < num_blocks_y and 0 <= new_col < num_blocks_x:
-                    adj_idx = new_row * num_blocks_x + new_col
-                    if adj_idx < len(block_types):
-                        adjacent.append(adj_idx)
-        return adjacent
-    
     # Create multiple instances of key amenities based on area - IMPROVED SCALING
     # Better ratios for residential societies in Pakistan:
     # Mosques: ~1 per 16-20 acres (community mosques)
@@ -8227,63 +8539,63 @@ def generate_amenity_overlays(block_polygons, block_types, seed=0, max_overlays=
     # Calculate how many amenities we need (limited by templates and max_overlays)
     num_amenities = min(len(amenity_templates), max_overlays)
     
+    # Block types as small ints so candidate filtering is plain mask arithmetic
+    type_codes = np.fromiter(
+        (BLOCK_TYPE_CODES.get(t, -1) for t in block_types), dtype=np.int8, count=len(block_types)
+    )
+    available = np.ones(len(block_types), dtype=bool)
+    blocked_in_range = [i for i in blocked_indices if 0 <= i < len(block_types)]
+    available[blocked_in_range] = False
+    
     # Use park blocks from the 20% green space allocation (parks + amenities = 20%)
     # Amenities are part of the green space, so use park blocks first
-    candidate_indices = [i for i, t in enumerate(block_types) if t == 'park' and i not in blocked_indices]
+    candidate_indices = np.flatnonzero(available & (type_codes == BLOCK_TYPE_CODES['park'])).tolist()
     
     # If not enough park blocks, we can use some commercial blocks as fallback
     # but this should be minimal since amenities should be part of green space
     if len(candidate_indices) < num_amenities:
         remaining_needed = num_amenities - len(candidate_indices)
-        commercial_candidates = [i for i, t in enumerate(block_types) if t == 'commercial' and i not in blocked_indices]
+        commercial_candidates = np.flatnonzero(available & (type_codes == BLOCK_TYPE_CODES['commercial'])).tolist()
         # Use minimal commercial blocks only if absolutely necessary
         candidate_indices.extend(commercial_candidates[:min(remaining_needed, len(commercial_candidates))])
         remaining_needed = num_amenities - len(candidate_indices)
         
         # If still not enough, add some residential blocks as last resort
         if remaining_needed > 0:
-            residential_candidates = [i for i, t in enumerate(block_types) if t == 'residential' and i not in blocked_indices]
+            residential_candidates = np.flatnonzero(available & (type_codes == BLOCK_TYPE_CODES['residential'])).tolist()
             candidate_indices.extend(residential_candidates[:min(remaining_needed, len(residential_candidates))])
     
     if not candidate_indices:
         return []
     
     # Smart distribution: Sort by position to spread amenities across the layout
-    # Calculate centroid positions for better distribution
-    def get_block_position(idx):
-        geom = block_polygons[idx]
-        if geom.is_empty:
-            return (0, 0)
-        centroid = geom.centroid
-        return (centroid.x, centroid.y)
+    # Calculate centroid positions for better distribution (empty blocks sit at the origin)
+    candidate_arr = np.asarray(candidate_indices)
+    candidate_geoms = np.asarray(block_polygons, dtype=object)[candidate_arr]
+    nonempty = ~shapely.is_empty(candidate_geoms)
+    positions = np.zeros((len(candidate_geoms), 2))
+    positions[nonempty] = shapely.get_coordinates(shapely.centroid(candidate_geoms[nonempty]))
     
     # Sort candidates by position to ensure spread (not clustered)
-    candidate_indices_with_pos = [(idx, get_block_position(idx)) for idx in candidate_indices]
     # Sort by distance from center to spread from center outward, or by grid position
     # Calculate layout center
-    all_x = [pos[1][0] for pos in candidate_indices_with_pos]
-    all_y = [pos[1][1] for pos in candidate_indices_with_pos]
-    center_x = (min(all_x) + max(all_x)) / 2 if all_x else 0
-    center_y = (min(all_y) + max(all_y)) / 2 if all_y else 0
+    center_x = (positions[:, 0].min() + positions[:, 0].max()) / 2
+    center_y = (positions[:, 1].min() + positions[:, 1].max()) / 2
     
     # Sort by distance from center, then by angle for circular distribution
-    def get_sort_key(item):
-        idx, (x, y) = item
-        dx, dy = x - center_x, y - center_y
-        dist = (dx**2 + dy**2)**0.5
-        angle = np.arctan2(dy, dx)  # Angle in radians
-        return (int(dist / 100), angle)  # Group by distance bands, then by angle
-    
-    candidate_indices_with_pos.sort(key=get_sort_key)
+    dx = positions[:, 0] - center_x
+    dy = positions[:, 1] - center_y
+    distance_band = (np.sqrt(dx ** 2 + dy ** 2) / 100).astype(int)  # Group by distance bands, then by angle
+    angle = np.arctan2(dy, dx)  # Angle in radians
+    ordered = candidate_arr[np.lexsort((angle, distance_band))].tolist()
     
     # Select evenly distributed indices - take from different distance bands
-    if len(candidate_indices_with_pos) > num_amenities:
+    if len(ordered) > num_amenities:
         # Take evenly spaced indices for better distribution
-        step = len(candidate_indices_with_pos) / num_amenities
-        selected_indices = [candidate_indices_with_pos[int(i * step)][0] for i in range(num_amenities)]
-        candidate_indices = selected_indices
+        step = len(ordered) / num_amenities
+        candidate_indices = [ordered[int(i * step)] for i in range(num_amenities)]
     else:
-        candidate_indices = [x[0] for x in candidate_indices_with_pos]
+        candidate_indices = ordered
     
     # Don't shuffle - keep the distribution order, just assign amenities in interleaved order
     overlays = []
@@ -8292,11 +8604,12 @@ def generate_amenity_overlays(block_polygons, block_types, seed=0, max_overlays=
     num_amenities = min(num_amenities, len(candidate_indices))
     
     # Log for debugging
-    logger.info(f"🏥 Amenity generation: {num_mosques} mosques, {num_hospitals} hospitals, {num_schools} schools")
-    logger.info(f"🏥 Total amenities: {len(amenity_templates)}, Selected blocks: {len(candidate_indices)}, Max: {max_overlays}, Will create: {num_amenities}")
+    logger.info("🏥 Amenity generation: %d mosques, %d hospitals, %d schools", num_mosques, num_hospitals, num_schools)
+    logger.info("🏥 Total amenities: %d, Selected blocks: %d, Max: %d, Will create: %d",
+                len(amenity_templates), len(candidate_indices), max_overlays, num_amenities)
     # IMPORTANT: Reserve some park blocks as pure parks (not all should become amenities)
     # Divide 20% green space: ~50% parks, ~50% amenities (better distribution for larger areas)
-    park_block_count = len([i for i, t in enumerate(block_types) if t == 'park'])
+    park_block_count = int(np.count_nonzero(type_codes == BLOCK_TYPE_CODES['park']))
     
     # Scale amenity allocation based on area - larger areas can support more amenities
     if area_acres < 30:
@@ -8309,11 +8622,14 @@ def generate_amenity_overlays(block_polygons, block_types, seed=0, max_overlays=
     max_amenity_blocks = max(1, int(park_block_count * amenity_percentage))
     num_amenities = min(num_amenities, max_amenity_blocks, len(candidate_indices))
     
-    logger.info(f"🏥 Distribution: {park_block_count} total park blocks (20% green space)")
-    logger.info(f"🏥 Using max {max_amenity_blocks} park blocks for amenities ({amenity_percentage*100:.0f}% of parks, leaving {park_block_count - max_amenity_blocks} as pure parks)")
-    logger.info(f"🏥 Distribution: Using {len([i for i in candidate_indices if block_types[i] == 'park'])} park blocks (from 20% green space), "
-                f"{len([i for i in candidate_indices if block_types[i] == 'commercial'])} commercial (fallback), "
-                f"{len([i for i in candidate_indices if block_types[i] == 'residential'])} residential (fallback)")
+    logger.info("🏥 Distribution: %d total park blocks (20%% green space)", park_block_count)
+    logger.info("🏥 Using max %d park blocks for amenities (%.0f%% of parks, leaving %d as pure parks)",
+                max_amenity_blocks, amenity_percentage * 100, park_block_count - max_amenity_blocks)
+    if logger.isEnabledFor(logging.INFO):
+        candidate_counts = Counter(block_types[i] for i in candidate_indices)
+        logger.info(f"🏥 Distribution: Using {candidate_counts['park']} park blocks (from 20% green space), "
+                    f"{candidate_counts['commercial']} commercial (fallback), "
+                    f"{candidate_counts['residential']} residential (fallback)")
     logger.info(f"🏥 CDA RULE: Same type amenities CANNOT be placed adjacent to each other")
     logger.info(f"🏥 IMPROVED RULE: Hospitals and Schools should NOT be placed adjacent to each other for better spacing")
     
@@ -8321,12 +8637,35 @@ def generate_amenity_overlays(block_polygons, block_types, seed=0, max_overlays=
     if len(amenity_templates) > num_amenities:
         logger.warning(f"⚠️ Cannot place all {len(amenity_templates)} amenities, only {num_amenities} blocks available (reserving some parks as pure parks)")
     
+    # Adjacent block indices (8-directional) of every candidate, computed once
+    candidate_arr = np.asarray(candidate_indices)
+    offset_rows = np.array([-1, -1, -1, 0, 0, 1, 1, 1])
+    offset_cols = np.array([-1, 0, 1, -1, 1, -1, 0, 1])
+    neighbor_rows = (candidate_arr // num_blocks_x)[:, None] + offset_rows
+    neighbor_cols = (candidate_arr % num_blocks_x)[:, None] + offset_cols
+    neighbor_idxs = neighbor_rows * num_blocks_x + neighbor_cols
+    neighbor_valid = (
+        (neighbor_rows >= 0) & (neighbor_rows < num_blocks_y)
+        & (neighbor_cols >= 0) & (neighbor_cols < num_blocks_x)
+        & (neighbor_idxs < len(block_types))
+    )
+    adjacency = {
+        idx: neighbor_idxs[k][neighbor_valid[k]]
+        for k, idx in enumerate(candidate_indices)
+    }
+    
     # Track placed amenities to check for same-type adjacency (CDA RULE: prevent same types together)
-    placed_amenities = {}  # {block_index: amenity_label}
+    placed_type = np.zeros(len(block_types), dtype=np.uint8)  # AMENITY_CODES per block, 0 = none
     used_candidate_indices = set()
     
     for i in range(num_amenities):
-        amenity_label = amenity_templates[i]["label"]
+        template = amenity_templates[i]
+        amenity_label = template["label"]
+        area_label = template["area"]
+        fill_color = template["color"]
+        text_color = template["text"]
+        amenity_code = AMENITY_CODES[amenity_label]
+        conflicting_codes = AMENITY_CONFLICTS[amenity_label]
         placed = False
         
         # Try to find a candidate block that doesn't have adjacent same-type amenities
@@ -8334,27 +8673,8 @@ def generate_amenity_overlays(block_polygons, block_types, seed=0, max_overlays=
             if candidate_idx in used_candidate_indices:
                 continue
             
-            # Check if any adjacent block has the same amenity type
-            adjacent_indices = get_adjacent_indices(candidate_idx)
-            has_same_type_adjacent = False
-            has_conflicting_adjacent = False
-            
-            for adj_idx in adjacent_indices:
-                # CDA RULE: Same types cannot be adjacent
-                if adj_idx in placed_amenities and placed_amenities[adj_idx] == amenity_label:
-                    has_same_type_adjacent = True
-                    break
-                
-                # IMPROVED RULE: Hospitals and Schools should not be adjacent to each other
-                if adj_idx in placed_amenities:
-                    adjacent_amenity = placed_amenities[adj_idx]
-                    if (amenity_label == "HOSPITAL" and adjacent_amenity == "SCHOOL") or \
-                       (amenity_label == "SCHOOL" and adjacent_amenity == "HOSPITAL"):
-                        has_conflicting_adjacent = True
-                        break
-            
             # CDA RULE: If no same-type adjacent and no conflicting adjacent, use this block
-            if not has_same_type_adjacent and not has_conflicting_adjacent:
+            if not np.isin(placed_type[adjacency[candidate_idx]], conflicting_codes).any():
                 idx = candidate_idx
                 geom = block_polygons[idx]
                 if geom.is_empty:
@@ -8363,18 +8683,22 @@ def generate_amenity_overlays(block_polygons, block_types, seed=0, max_overlays=
                 inset_x = (maxx - minx) * 0.18
                 inset_y = (maxy - miny) * 0.18
                 amenity_box = box(minx + inset_x, miny + inset_y, maxx - inset_x, maxy - inset_y)
-                amenity_geom = geom.intersection(amenity_box)
+                if _is_axis_aligned_rectangle(geom):
+                    # The inset box already lies inside a rectangular block
+                    amenity_geom = amenity_box
+                else:
+                    amenity_geom = geom.intersection(amenity_box)
                 if amenity_geom.is_empty:
                     amenity_geom = geom
                 overlays.append({
                     "block_index": idx,
                     "geometry": amenity_geom,
                     "label": amenity_label,
-                    "area_label": amenity_templates[i]["area"],
-                    "color": amenity_templates[i]["color"],
-                    "text": amenity_templates[i]["text"]
+                    "area_label": area_label,
+                    "color": fill_color,
+                    "text": text_color
                 })
-                placed_amenities[idx] = amenity_label
+                placed_type[idx] = amenity_code
                 used_candidate_indices.add(idx)
                 placed = True
                 break
@@ -8385,9 +8709,10 @@ def generate_amenity_overlays(block_polygons, block_types, seed=0, max_overlays=
     
     logger.info(f"✅ Placed {len(overlays)} amenities (CDA compliant: same types are NOT adjacent, Hospitals/Schools are SEPARATED)")
     logger.info(f"✅ Remaining {park_block_count - len(overlays)} park blocks will remain as pure parks for green space")
-    logger.info(f"📊 Final distribution: {len([o for o in overlays if o['label'] == 'MOSQUE'])} mosques, "
-                f"{len([o for o in overlays if o['label'] == 'HOSPITAL'])} hospitals, "
-                f"{len([o for o in overlays if o['label'] == 'SCHOOL'])} schools")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"📊 Final distribution: {len([o for o in overlays if o['label'] == 'MOSQUE'])} mosques, "
+                    f"{len([o for o in overlays if o['label'] == 'HOSPITAL'])} hospitals, "
+                    f"{len([o for o in overlays if o['label'] == 'SCHOOL'])} schools")
     return overlays
 
 def draw_amenity_overlays(ax, overlays, label_sizes, clip_path=None, geometry_drawer=None, label_point_fn=None):
@@ -8395,20 +8720,6 @@ def draw_amenity_overlays(ax, overlays, label_sizes, clip_path=None, geometry_dr
     Draw amenity overlays using provided geometry/label helpers.
     Falls back to simplified versions if helpers are not supplied (e.g., outside viz pipeline).
     """
-    def _default_drawer(ax, geometry, **patch_kwargs):
-        drawn = []
-        if geometry.is_empty:
-            return drawn
-        if isinstance(geometry, MultiPolygon):
-            for part in geometry.geoms:
-                drawn.extend(_default_drawer(ax, part, **patch_kwargs))
-        elif isinstance(geometry, Polygon):
-            coords = np.asarray(geometry.exterior.coords)
-            patch = patches.Polygon(coords, closed=True, **patch_kwargs)
-            ax.add_patch(patch)
-            drawn.append(patch)
-        return drawn
-    
     def _default_label_point(geometry):
         try:
             pt = geometry.representative_point()
@@ -8417,24 +8728,48 @@ def draw_amenity_overlays(ax, overlays, label_sizes, clip_path=None, geometry_dr
             centroid = geometry.centroid
             return centroid.x, centroid.y
     
-    drawer = geometry_drawer if geometry_drawer is not None else lambda a, g, **kw: _default_drawer(a, g, **kw)
     labeler = label_point_fn if label_point_fn is not None else _default_label_point
     
+    if geometry_drawer is None:
+        # Default rendering: every amenity polygon (exterior ring) in one PolyCollection
+        verts = []
+        facecolors = []
+        for amenity in overlays:
+            geom = amenity["geometry"]
+            if geom.is_empty or shapely.get_type_id(geom) not in (3, 6):  # Polygon, MultiPolygon
+                continue
+            for part in shapely.get_parts(geom):
+                verts.append(shapely.get_coordinates(part.exterior))
+                facecolors.append(amenity["color"])
+        if verts:
+            amenity_polys = PolyCollection(
+                verts,
+                facecolors=facecolors,
+                edgecolors='black',
+                linewidths=2.5,
+                alpha=0.95,
+                zorder=4.5
+            )
+            ax.add_collection(amenity_polys)
+            if clip_path is not None:
+                amenity_polys.set_clip_path(clip_path)
+    else:
+        for amenity in overlays:
+            patches_drawn = geometry_drawer(
+                ax,
+                amenity["geometry"],
+                facecolor=amenity["color"],
+                edgecolor='black',
+                linewidth=2.5,
+                alpha=0.95,
+                zorder=4.5
+            )
+            for p in patches_drawn:
+                if clip_path is not None:
+                    p.set_clip_path(clip_path)
+    
     for amenity in overlays:
         geom = amenity["geometry"]
-        patches_drawn = drawer(
-            ax,
-            geom,
-            facecolor=amenity["color"],
-            edgecolor='black',
-            linewidth=2.5,
-            alpha=0.95,
-            zorder=4.5
-        )
-        for p in patches_drawn:
-            if clip_path is not None:
-                p.set_clip_path(clip_path)
-        
         label_x, label_y = labeler(geom)
         ax.text(
             label_x,
@@ -8482,15 +8817,17 @@ def calculate_block_marla(block_geom, area_acres, total_blocks, block_type):
     # Account for infrastructure (roads, utilities) - typically 10-15% of block
     usable_marla = block_marla * 0.88  # 88% usable after infrastructure
     
-    logger.debug(f"📐 Block marla calculation: {block_area_sqm:.0f} sqm = {block_marla:.2f} marla (usable: {usable_marla:.2f} marla)")
+    logger.debug("📐 Block marla calculation: %.0f sqm = %.2f marla (usable: %.2f marla)", block_area_sqm, block_marla, usable_marla)
     
     return usable_marla, block_marla
 
+@functools.lru_cache(maxsize=4096)
 def get_plot_size_from_marla(block_marla, block_type='residential'):
     """
     Determine realistic plot size based on available marla in the block.
     Returns plot size label (e.g., '5 MARLA', '7 MARLA', etc.)
     CDA Standard: Only 20, 15, 7, and 5 marla plots.
+    Cached on the exact marla value: grid layouts repeat identical blocks.
     """
     if block_type == 'residential':
         # CDA Standard residential plot sizes: 20, 15, 7, and 5 marla only
@@ -8529,47 +8866,56 @@ def get_plot_size_from_marla(block_marla, block_type='residential'):
 def get_mixed_plot_sizes(area_acres, block_type, block_geom=None, total_blocks=None):
     """
     Determine mixed plot sizes for variety across blocks.
-    Returns a list of available plot sizes that different blocks can use.
+    Returns a tuple of available plot sizes that different blocks can use.
     CDA Standard Plot Sizes: 20, 15, 7, and 5 marla only.
     """
+    return _mixed_plot_sizes(block_type, area_acres), None
+
+@functools.lru_cache(maxsize=1024)
+def _mixed_plot_sizes(block_type, area_acres):
     # CDA Standard: Only 20, 15, 7, and 5 marla plots
     if block_type == 'residential':
         # Always return the 4 standard CDA plot sizes for variety
         # Different blocks will get different sizes from this list
-        plot_sizes = ['20 MARLA', '15 MARLA', '7 MARLA', '5 MARLA']
+        return ('20 MARLA', '15 MARLA', '7 MARLA', '5 MARLA')
     
     elif block_type == 'commercial':
         if area_acres < 10:
-            plot_sizes = ['SHOP', 'SHOP', 'STORE']
+            return ('SHOP', 'SHOP', 'STORE')
         elif area_acres < 25:
-            plot_sizes = ['SHOP', 'STORE', 'MALL', 'SHOP']
+            return ('SHOP', 'STORE', 'MALL', 'SHOP')
         elif area_acres < 50:
-            plot_sizes = ['SHOP', 'STORE', 'MALL', 'RETAIL', 'SHOP']
+            return ('SHOP', 'STORE', 'MALL', 'RETAIL', 'SHOP')
         else:
-            plot_sizes = ['SHOP', 'STORE', 'MALL', 'RETAIL', 'SUPERMARKET', 'SHOP']
+            return ('SHOP', 'STORE', 'MALL', 'RETAIL', 'SUPERMARKET', 'SHOP')
     else:
-        plot_sizes = ['PARK']
-    
-    return plot_sizes, None
+        return ('PARK',)
 
 
 def _sample_points_within_polygon(polygon, count, seed=0):
     """Sample deterministic pseudo-random points that lie inside the polygon."""
-    import random
-
     rng = random.Random(seed)
     min_x, min_y, max_x, max_y = polygon.bounds
     points = []
     attempts = 0
     max_attempts = max(count * 50, 500)
+    batch = max(count * 4, 512)
 
+    # A seeded (scrambled) Halton sequence covers the bounding box evenly, so
+    # thin or irregular polygons need far fewer candidates than plain random
+    # draws; each batch is tested with one contains call
+    sampler = qmc.Halton(d=2, seed=seed)
     while len(points) < count and attempts < max_attempts:
-        x = rng.uniform(min_x, max_x)
-        y = rng.uniform(min_y, max_y)
-        candidate = Point(x, y)
-        if polygon.contains(candidate):
-            points.append(candidate)
-        attempts += 1
+        size = min(batch, max_attempts - attempts)
+        draws = sampler.random(n=size)
+        candidates = shapely.points(
+            min_x + (max_x - min_x) * draws[:, 0],
+            min_y + (max_y - min_y) * draws[:, 1],
+        )
+        inside = candidates[shapely.contains(polygon, candidates)]
+        points.extend(inside[:count - len(points)])
+        attempts += size
+        batch *= 2
 
     if len(points) < count:
         # Fallback: jitter representative point to reach desired count
@@ -8603,50 +8949,115 @@ def create_shape_aware_blocks(layout_polygon, total_blocks, seed=0):
         logger.warning(f"Voronoi generation failed ({exc}), falling back to simple blocks.")
         return [layout_polygon]
 
-    cells = []
-    for cell in voronoi.geoms:
-        clipped = cell.intersection(layout_polygon)
-        if not clipped.is_empty:
-            # Ensure we work with simple polygons for rendering
-            cells.append(clipped.buffer(0))
+    # Clip every Voronoi cell at once; keep simple polygons for rendering
+    clipped = shapely.intersection(shapely.get_parts(voronoi), layout_polygon)
+    cells = shapely.buffer(clipped[~shapely.is_empty(clipped)], 0)
 
     # If Voronoi produced fewer cells (degenerate cases), duplicate the largest ones
-    if len(cells) < total_blocks and cells:
-        cells.sort(key=lambda geom: geom.area, reverse=True)
-        idx = 0
-        while len(cells) < total_blocks:
-            cells.append(cells[idx % len(cells)].buffer(0))
-            idx += 1
+    if 0 < len(cells) < total_blocks:
+        cells = cells[np.argsort(-shapely.area(cells), kind='stable')]
+        duplicates = cells[np.arange(total_blocks - len(cells)) % len(cells)]
+        cells = np.concatenate([cells, shapely.make_valid(duplicates)])
 
     # If too many, keep the ones with bigger area to avoid tiny slivers
     if len(cells) > total_blocks:
-        cells.sort(key=lambda geom: geom.area, reverse=True)
-        cells = cells[:total_blocks]
+        cells = cells[np.argsort(-shapely.area(cells), kind='stable')[:total_blocks]]
 
     # Sort cells from top-left to bottom-right for consistent labeling
-    cells.sort(key=lambda geom: (-geom.centroid.y, geom.centroid.x))
+    centroids = shapely.centroid(cells)
+    cells = cells[np.lexsort((shapely.get_x(centroids), -shapely.get_y(centroids)))]
 
-    return cells
+    return list(cells)
 
 def create_rectangular_blocks(layout_polygon, min_x, start_y, block_width, block_height, num_blocks_x, num_blocks_y):
     """
     Generate axis-aligned rectangular blocks clipped to the layout polygon.
     Produces predictable grids similar to professional township layouts.
     """
-    blocks = []
-    for row in range(num_blocks_y):
-        for col in range(num_blocks_x):
-            x0 = min_x + col * block_width
-            x1 = x0 + block_width
-            y0 = start_y + row * block_height
-            y1 = y0 + block_height
-            cell = box(x0, y0, x1, y1)
-            clipped = cell.intersection(layout_polygon)
-            if clipped.is_empty:
-                blocks.append(Polygon())
-            else:
-                blocks.append(clipped)
-    return blocks
+    # All cells row-major, built and clipped in single vectorized calls
+    rows, cols = np.divmod(np.arange(num_blocks_x * num_blocks_y), num_blocks_x)
+    x0 = min_x + cols * block_width
+    y0 = start_y + rows * block_height
+    cells = shapely.box(x0, y0, x0 + block_width, y0 + block_height)
+    
+    # Only cells crossing the boundary need a real intersection: interior cells are
+    # kept as-is and cells outside the layout become empty
+    shapely.prepare(layout_polygon)
+    inside = shapely.contains(layout_polygon, cells)
+    crossing = ~inside & shapely.intersects(layout_polygon, cells)
+    blocks = np.full(len(cells), None, dtype=object)
+    blocks[inside] = cells[inside]
+    clipped = shapely.intersection(cells[crossing], layout_polygon)
+    blocks[crossing] = np.where(shapely.is_empty(clipped), None, clipped)
+    return [Polygon() if block is None else block for block in blocks]
+
+# Zone codes used by create_dynamic_cda_layout; CDA_ZONE_TYPES maps a code to its zone name
+RESIDENTIAL_ZONE, COMMERCIAL_ZONE, PARK_ZONE = 0, 1, 2
+UNASSIGNED_ZONE = -1
+CDA_ZONE_TYPES = ('residential', 'commercial', 'park')
+
+@functools.lru_cache(maxsize=256)
+def _compute_zone_grid(unique_seed, num_blocks_x, num_blocks_y, commercial_blocks, green_blocks):
+    """
+    Row-major CDA zone codes for a seeded grid; pure, so repeated layouts are cached.
+    """
+    # Block positions are flat row-major indices (row * num_blocks_x + col)
+    total_blocks = num_blocks_x * num_blocks_y
+    rows, cols = np.divmod(np.arange(total_blocks), num_blocks_x)
+    
+    # Shuffle positions for REALISTIC variation (seed derived from polygon, area and terrain)
+    shuffled = list(range(total_blocks))
+    random.Random(unique_seed).shuffle(shuffled)
+    shuffled = np.array(shuffled, dtype=np.intp)
+    
+    # Zone code per block, UNASSIGNED_ZONE until placed (see CDA_ZONE_TYPES)
+    zone_codes = np.full(total_blocks, UNASSIGNED_ZONE, dtype=np.int8)
+    
+    # Terrain suitability: corners (3) are best for commercial, then edges (2), then interior (1)
+    is_row_edge = (rows == 0) | (rows == num_blocks_y - 1)
+    is_col_edge = (cols == 0) | (cols == num_blocks_x - 1)
+    suitability = 1 + (is_row_edge | is_col_edge) + (is_row_edge & is_col_edge)
+    
+    # Sort positions by suitability (stable, so shuffled order breaks ties)
+    all_positions = shuffled[np.argsort(-suitability[shuffled], kind='stable')]
+    
+    # Assign commercial blocks to best positions (corners and edges)
+    zone_codes[all_positions[:commercial_blocks]] = COMMERCIAL_ZONE
+    
+    # Assign green spaces to remaining positions (considering terrain risk)
+    # CDA RULE: Parks cannot be adjacent to each other for better distribution
+    # BUT we MUST assign exactly green_blocks parks to maintain 20% distribution
+    green_assigned = 0
+    remaining_positions = all_positions[commercial_blocks:]
+    
+    # Park board padded by one cell so every 3x3 neighbourhood is in bounds
+    park_mask = np.zeros((num_blocks_y + 2, num_blocks_x + 2), dtype=bool)
+    
+    # First pass: Try to assign parks avoiding adjacency
+    for pos in remaining_positions:
+        if green_assigned >= green_blocks:
+            break
+            
+        # Check all 8 adjacent positions (the position itself is never a park yet)
+        row, col = rows[pos], cols[pos]
+        is_adjacent_to_park = park_mask[row:row + 3, col:col + 3].any()
+        
+        # CDA RULE: Prefer non-adjacent positions for parks, but ensure we get exactly green_blocks
+        if not is_adjacent_to_park:
+            zone_codes[pos] = PARK_ZONE
+            park_mask[row + 1, col + 1] = True
+            green_assigned += 1
+    
+    # Second pass: If we still need more parks, assign them even if adjacent (to maintain exact 20%)
+    if green_assigned < green_blocks:
+        unassigned = remaining_positions[zone_codes[remaining_positions] == UNASSIGNED_ZONE]
+        extra_parks = unassigned[:green_blocks - green_assigned]
+        zone_codes[extra_parks] = PARK_ZONE
+    
+    # Assign remaining positions as residential (to ensure exactly 50% residential)
+    zone_codes[zone_codes == UNASSIGNED_ZONE] = RESIDENTIAL_ZONE
+    
+    return tuple(zone_codes.tolist())
 
 def create_dynamic_cda_layout(polygon_coords, num_blocks_x, num_blocks_y, mean_slope, flood_risk, erosion_risk, mean_elevation, area_acres):
     """
@@ -8679,105 +9090,20 @@ def create_dynamic_cda_layout(polygon_coords, num_blocks_x, num_blocks_y, mean_s
     logger.info(f"🔴 COMMERCIAL BLOCKS: {commercial_blocks} blocks will be assigned commercial zone type")
     logger.info(f"🟢 GREEN SPACE: {green_blocks} blocks will be divided between parks and amenities (total 20%)")
     
-    # Create a list of all block positions
-    all_positions = []
-    for row in range(num_blocks_y):
-        for col in range(num_blocks_x):
-            all_positions.append((row, col))
-    
     # Shuffle positions for REALISTIC variation based on multiple factors
-    import random
     # Use polygon ID, area, and terrain data for unique layouts
     unique_seed = int(polygon_coords[0][0] * 1000 + polygon_coords[0][1] * 1000 + area_sqm + mean_slope * 10) % 10000
-    random.seed(unique_seed)
-    random.shuffle(all_positions)
-    
-    # Assign zones based on CDA distribution with TERRAIN-BASED intelligence
-    zone_assignments = {}
-    
-    # Sort positions by terrain suitability for intelligent placement
-    def get_position_suitability(pos):
-        row, col = pos
-        # Corner positions are better for commercial
-        is_corner = (row == 0 or row == num_blocks_y-1) and (col == 0 or col == num_blocks_x-1)
-        is_edge = (row == 0 or row == num_blocks_y-1 or col == 0 or col == num_blocks_x-1)
-        is_center = not is_edge
-        
-        # Calculate suitability score
-        if is_corner:
-            return 3  # Best for commercial
-        elif is_edge:
-            return 2  # Good for commercial or residential
-        else:
-            return 1  # Best for residential
-    
-    # Sort positions by suitability
-    all_positions.sort(key=get_position_suitability, reverse=True)
-    
-    # Assign commercial blocks to best positions (corners and edges)
-    for i in range(commercial_blocks):
-        if i < len(all_positions):
-            zone_assignments[all_positions[i]] = 'commercial'
-    
-    # Assign green spaces to remaining positions (considering terrain risk)
-    # CDA RULE: Parks cannot be adjacent to each other for better distribution
-    # BUT we MUST assign exactly green_blocks parks to maintain 20% distribution
-    green_assigned = 0
-    remaining_positions = all_positions[commercial_blocks:]
-    
-    # First pass: Try to assign parks avoiding adjacency
-    for pos in remaining_positions:
-        if green_assigned >= green_blocks:
-            break
-            
-        # Check if this position is adjacent to any existing park
-        row, col = pos
-        is_adjacent_to_park = False
-        
-        # Check all 8 adjacent positions
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue  # Skip the position itself
-                adjacent_pos = (row + dr, col + dc)
-                if adjacent_pos in zone_assignments and zone_assignments[adjacent_pos] == 'park':
-                    is_adjacent_to_park = True
-                    break
-            if is_adjacent_to_park:
-                break
-        
-        # CDA RULE: Prefer non-adjacent positions for parks, but ensure we get exactly green_blocks
-        if not is_adjacent_to_park:
-            zone_assignments[pos] = 'park'
-            green_assigned += 1
-    
-    # Second pass: If we still need more parks, assign them even if adjacent (to maintain exact 20%)
-    if green_assigned < green_blocks:
-        for pos in remaining_positions:
-            if green_assigned >= green_blocks:
-                break
-            if pos not in zone_assignments:  # Not yet assigned
-                zone_assignments[pos] = 'park'
-                green_assigned += 1
-    
-    # Assign remaining positions as residential (to ensure exactly 50% residential)
-    for pos in remaining_positions:
-        if pos not in zone_assignments:
-            zone_assignments[pos] = 'residential'
+    zone_codes = np.array(
+        _compute_zone_grid(unique_seed, num_blocks_x, num_blocks_y, commercial_blocks, green_blocks),
+        dtype=np.int8
+    )
     
     # Create the layout grid
-    block_layout = []
-    for row in range(num_blocks_y):
-        layout_row = []
-        for col in range(num_blocks_x):
-            zone_type = zone_assignments.get((row, col), 'residential')
-            layout_row.append(zone_type)
-        block_layout.append(layout_row)
+    zone_names = np.array(CDA_ZONE_TYPES, dtype=object)
+    block_layout = zone_names[zone_codes].reshape(num_blocks_y, num_blocks_x).tolist()
     
     # Verify the distribution matches target percentages
-    actual_residential = sum(1 for row in block_layout for zone in row if zone == 'residential')
-    actual_commercial = sum(1 for row in block_layout for zone in row if zone == 'commercial')
-    actual_green = sum(1 for row in block_layout for zone in row if zone == 'park')
+    actual_residential, actual_commercial, actual_green = np.bincount(zone_codes, minlength=len(CDA_ZONE_TYPES)).tolist()
     
     actual_residential_pct = (actual_residential / total_blocks * 100) if total_blocks > 0 else 0
     actual_commercial_pct = (actual_commercial / total_blocks * 100) if total_blocks > 0 else 0
@@ -8801,6 +9127,76 @@ def create_dynamic_cda_layout(polygon_coords, num_blocks_x, num_blocks_y, mean_s
     
     return block_layout
 
+def scale_polygon_to_layout(coords_array, target_width, target_height, offset_x, offset_y, padding_ratio=0.05):
+    """
+    Normalize user polygon coordinates so they fit inside the planning canvas
+    while preserving shape and aspect ratio.
+    """
+    if coords_array is None or coords_array.size == 0:
+        return coords_array
+    
+    xy = coords_array[:, :2]
+    mins = xy.min(axis=0)
+    geo_width, geo_height = xy.max(axis=0) - mins
+    if geo_width == 0:
+        geo_width = 1e-6
+    if geo_height == 0:
+        geo_height = 1e-6
+    
+    padding_x = target_width * padding_ratio
+    padding_y = target_height * padding_ratio
+    available_width = max(target_width - 2 * padding_x, 1e-3)
+    available_height = max(target_height - 2 * padding_y, 1e-3)
+    scale = min(available_width / geo_width, available_height / geo_height)
+    
+    scaled_width = geo_width * scale
+    scaled_height = geo_height * scale
+    extra_x = (available_width - scaled_width) / 2
+    extra_y = (available_height - scaled_height) / 2
+    
+    # One output buffer, shifted and scaled in place
+    scaled = np.subtract(xy, mins)
+    scaled *= scale
+    scaled += (offset_x + padding_x + extra_x, offset_y + padding_y + extra_y)
+    return scaled
+
+def _label_points(geometries):
+    """Label anchors (x, y) for many geometries from one batched point_on_surface call."""
+    geoms = np.asarray(geometries, dtype=object)
+    xy = np.full((len(geoms), 2), np.nan)
+    nonempty = ~shapely.is_empty(geoms)
+    try:
+        xy[nonempty] = shapely.get_coordinates(shapely.point_on_surface(geoms[nonempty]))
+    except shapely.errors.GEOSException:
+        # One bad geometry fails the whole batch: redo it per geometry, centroid on failure
+        for idx in np.flatnonzero(nonempty):
+            try:
+                pt = geoms[idx].representative_point()
+            except Exception:
+                pt = geoms[idx].centroid
+            xy[idx] = pt.x, pt.y
+    return xy.tolist()
+
+def _exterior_rings(geometries):
+    """Exterior rings of every polygon part of geometries, in order, as open (n, 2) arrays."""
+    geoms = np.asarray(geometries, dtype=object)
+    geoms = geoms[np.isin(shapely.get_type_id(geoms), (3, 6))]  # Polygon / MultiPolygon only
+    parts = shapely.get_parts(geoms)
+    rings = shapely.get_exterior_ring(parts[~shapely.is_empty(parts)])
+    coords = shapely.get_coordinates(rings)
+    ends = np.cumsum(shapely.get_num_coordinates(rings)).tolist()
+    # Closed rings repeat their first vertex; drop it so patches and collections close them once
+    return [coords[start:end - 1] for start, end in zip([0] + ends[:-1], ends)]
+
+# Label box styles shared by every 2D zoning render (read-only; matplotlib copies them)
+_BBOX_TITLE = MappingProxyType({"boxstyle": "round,pad=0.6", "facecolor": "#e0f2fe", "edgecolor": "black", "linewidth": 2})
+_BBOX_SUBTITLE = MappingProxyType({"boxstyle": "round,pad=0.4", "facecolor": "#e0f2fe", "edgecolor": "black", "linewidth": 2})
+_BBOX_PLOT_NUMBER = MappingProxyType({"boxstyle": "round,pad=0.2", "facecolor": "white", "edgecolor": "black", "linewidth": 0.5, "alpha": 0.9})
+_BBOX_PARK_LABEL = MappingProxyType({"boxstyle": "round,pad=0.2", "facecolor": "black", "alpha": 0.3, "edgecolor": "white", "linewidth": 1.5})
+_BBOX_SUMMARY = MappingProxyType({"boxstyle": "round,pad=0.25", "facecolor": "#fef3c7", "edgecolor": "#d97706", "linewidth": 1.5})
+_BBOX_MAP_LABEL = MappingProxyType({"boxstyle": "round,pad=0.25", "facecolor": "#e0f2fe", "edgecolor": "black", "linewidth": 1.5})
+_BBOX_SCALE_LABEL = MappingProxyType({"boxstyle": "round,pad=0.15", "facecolor": "#e0f2fe", "edgecolor": "black", "linewidth": 1.5})
+
 def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None):
     """
     Create a CDA COMPLIANT PROFESSIONAL SOCIETY LAYOUT
@@ -8827,7 +9223,6 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
             "scale": 10,
             "branding": 9,
         }
-        block_bbox_settings = {"boxstyle": "round,pad=0.25", "facecolor": "white", "alpha": 0.9, "edgecolor": "black", "linewidth": 1.5}
 
         # Get REAL terrain data from the analysis
         terrain_summary = zoning_data.get('terrain_summary', {})
@@ -8865,53 +9260,11 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
         
         logger.info(f"🎯 REAL TERRAIN DATA - Elevation: {actual_elevation}m, Slope: {actual_slope}°, Flood: {actual_flood_risk}%, Erosion: {actual_erosion_risk}")
         
-        def scale_polygon_to_layout(coords_array, target_width, target_height, offset_x, offset_y, padding_ratio=0.05):
-            """
-            Normalize user polygon coordinates so they fit inside the planning canvas
-            while preserving shape and aspect ratio.
-            """
-            if coords_array is None or coords_array.size == 0:
-                return coords_array
-            
-            xs = coords_array[:, 0]
-            ys = coords_array[:, 1]
-            min_geo_x, max_geo_x = xs.min(), xs.max()
-            min_geo_y, max_geo_y = ys.min(), ys.max()
-            
-            geo_width = max_geo_x - min_geo_x
-            geo_height = max_geo_y - min_geo_y
-            if geo_width == 0:
-                geo_width = 1e-6
-            if geo_height == 0:
-                geo_height = 1e-6
-            
-            padding_x = target_width * padding_ratio
-            padding_y = target_height * padding_ratio
-            available_width = max(target_width - 2 * padding_x, 1e-3)
-            available_height = max(target_height - 2 * padding_y, 1e-3)
-            scale = min(available_width / geo_width, available_height / geo_height)
-            
-            scaled_width = geo_width * scale
-            scaled_height = geo_height * scale
-            extra_x = (available_width - scaled_width) / 2
-            extra_y = (available_height - scaled_height) / 2
-            
-            scaled_x = offset_x + padding_x + extra_x + (xs - min_geo_x) * scale
-            scaled_y = offset_y + padding_y + extra_y + (ys - min_geo_y) * scale
-            
-            return np.column_stack((scaled_x, scaled_y))
-
         def draw_geometry(ax, geometry, **patch_kwargs):
             """Draw shapely geometry (Polygon or MultiPolygon) onto the axes."""
             drawn_patches = []
-            if geometry.is_empty:
-                return drawn_patches
-            if isinstance(geometry, MultiPolygon):
-                for geom_part in geometry.geoms:
-                    drawn_patches.extend(draw_geometry(ax, geom_part, **patch_kwargs))
-            elif isinstance(geometry, Polygon):
-                coords = np.asarray(geometry.exterior.coords)
-                patch = patches.Polygon(coords, closed=True, **patch_kwargs)
+            for ring in _exterior_rings([geometry]):
+                patch = patches.Polygon(ring, closed=True, **patch_kwargs)
                 ax.add_patch(patch)
                 drawn_patches.append(patch)
             return drawn_patches
@@ -8937,8 +9290,7 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
         def extract_marla_from_plot_size(plot_size_str):
             """Extract marla number from strings like '5 MARLA', '7 MARLA', etc."""
             if isinstance(plot_size_str, str):
-                import re
-                match = re.search(r'(\d+(?:\.\d+)?)\s*MARLA', plot_size_str.upper())
+                match = _MARLA_RE.search(plot_size_str)
                 if match:
                     return float(match.group(1))
             return 0.0
@@ -9047,7 +9399,7 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
         ax.text(layout_center_x, 13.5, society_name, 
                 fontsize=label_sizes["title"], fontweight='bold', 
                 ha='center', va='center', color='black',
-                bbox=dict(boxstyle="round,pad=0.6", facecolor='#e0f2fe', edgecolor='black', linewidth=2))
+                bbox=_BBOX_TITLE)
         
         # CDA COMPLIANT subtitle with VARIED selection based on multiple factors
         district_seed = int(area_sqm + mean_slope + polygon_coords[0][1] * 100) % 4
@@ -9063,7 +9415,7 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
         ax.text(layout_center_x, 12.8, district_type, 
                 fontsize=label_sizes["subtitle"], fontweight='bold', 
                 ha='center', va='center', color='black',
-                bbox=dict(boxstyle="round,pad=0.4", facecolor='#e0f2fe', edgecolor='black', linewidth=2))
+                bbox=_BBOX_SUBTITLE)
         
         # PROFESSIONAL terrain data bar with slope warnings - ABOVE the map with proper spacing
         polygon_id = zoning_data.get('polygon_id', 'N/A')
@@ -9131,8 +9483,9 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
         num_blocks_y = max(3, int(np.sqrt(num_blocks / aspect_ratio)))
         num_blocks_x = max(3, int(num_blocks / num_blocks_y))
         
-        # Ensure we have at least the target number of blocks
-        while num_blocks_x * num_blocks_y < num_blocks and num_blocks_x * num_blocks_y < 500:
+        # Ensure we have at least the target number of blocks: x = floor(n / y) leaves a
+        # shortfall below y, so growing the shorter side by one always covers it
+        if num_blocks_x * num_blocks_y < num_blocks:
             if num_blocks_x <= num_blocks_y:
                 num_blocks_x += 1
             else:
@@ -9166,7 +9519,18 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
             num_blocks_x,
             num_blocks_y
         )
-        block_types = [zone for row in block_layout for zone in row]
+        block_types = list(chain.from_iterable(block_layout))
+        block_type_counts = Counter(block_types)
+
+        # Per-block representative points as flat arrays (NaN for empty blocks), computed
+        # once for the roundabout reservation and the park labels
+        block_array = np.asarray(block_polygons, dtype=object)
+        block_nonempty = ~shapely.is_empty(block_array)
+        block_rep_points = shapely.point_on_surface(block_array)
+        block_rep_x = np.full(len(block_array), np.nan)
+        block_rep_y = np.full(len(block_array), np.nan)
+        block_rep_x[block_nonempty] = shapely.get_x(block_rep_points[block_nonempty])
+        block_rep_y[block_nonempty] = shapely.get_y(block_rep_points[block_nonempty])
 
         draw_rectilinear_road_network(
             ax,
@@ -9195,10 +9559,8 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
                 count=max(2, num_blocks_x // 3)
             )
 
-        reserved_block_indices = set()
         # Determine roundabout placement based on polygon area and interior grid
         roundabout_specs = []
-        reserved_block_indices.clear()
         if layout_polygon and not layout_polygon.is_empty:
             padding_ratio = 0.18
             min_ratio = padding_ratio
@@ -9217,42 +9579,61 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
             vertical_offsets = np.linspace(0.45, 0.6, roundabout_count)
             base_radius = max(min(block_width, block_height) * 0.5, road_width * 2.2)
 
-            for idx, (rx, ry) in enumerate(zip(ratios, vertical_offsets)):
-                cx = min_x + width * float(rx)
-                cy = start_y + height * float(ry)
+            # The layout is fixed, so each inset buffer is built (and prepared) at most
+            # once and shared by every roundabout: inner ones by attempt, interior ones by radius
+            inner_buffers = {}
+            interior_buffers = {}
+
+            def cached_buffer(cache, key, distance):
+                if key not in cache:
+                    buffered = layout_polygon.buffer(distance)
+                    shapely.prepare(buffered)
+                    cache[key] = buffered
+                return cache[key]
+
+            # Candidate centres per roundabout (rows) and attempt (columns): each failed
+            # attempt nudges the centre down by 5% of a block height
+            cxs = min_x + width * ratios
+            cys = (start_y + height * vertical_offsets)[:, None] - block_height * 0.05 * np.arange(19)
+            attempt = np.full(roundabout_count, 18)
+            pending = np.arange(roundabout_count)
+            for attempts in range(18):
+                if not len(pending):
+                    break
+                inner_buffer = cached_buffer(inner_buffers, attempts, -road_width * (0.5 + attempts * 0.05))
+                inside = shapely.contains_xy(inner_buffer, cxs[pending], cys[pending, attempts])
+                attempt[pending[inside]] = attempts
+                pending = pending[~inside]
+
+            cys = cys[np.arange(roundabout_count), attempt]
+            in_layout = shapely.contains_xy(layout_polygon, cxs, cys)
+            for idx in np.flatnonzero(in_layout).tolist():
+                candidate = Point(cxs[idx], cys[idx])
                 radius = base_radius * max(1.0, 1.3 - idx * 0.1)
+                interior_buffer = cached_buffer(interior_buffers, radius, -radius * 1.1)
+                if interior_buffer.is_empty or not interior_buffer.contains(candidate):
+                    continue
+                roundabout_specs.append({
+                    "center": (candidate.x, candidate.y),
+                    "radius": radius
+                })
 
-                candidate = Point(cx, cy)
-                attempts = 0
-                while attempts < 18:
-                    inner_buffer = layout_polygon.buffer(-road_width * (0.5 + attempts * 0.05))
-                    if not inner_buffer.is_empty and inner_buffer.contains(candidate):
-                        break
-                    cy = start_y + height * float(ry) - block_height * 0.05 * (attempts + 1)
-                    candidate = Point(cx, cy)
-                    attempts += 1
-
-                if layout_polygon.contains(candidate):
-                    interior_buffer = layout_polygon.buffer(-radius * 1.1)
-                    if interior_buffer.is_empty or not interior_buffer.contains(candidate):
-                        continue
-                    roundabout_specs.append({
-                        "center": (candidate.x, candidate.y),
-                        "radius": radius
-                    })
-
+        # Blocks whose representative point falls inside a roundabout's influence circle
+        reserved_block_indices = frozenset()
         if roundabout_specs:
-            for spec in roundabout_specs:
-                influence = Point(spec["center"]).buffer(spec["radius"] * 1.35, resolution=96)
-                for idx, geom in enumerate(block_polygons):
-                    if idx in reserved_block_indices or geom.is_empty:
-                        continue
-                    try:
-                        rep_point = geom.representative_point()
-                    except Exception:
-                        continue
-                    if influence.contains(rep_point):
-                        reserved_block_indices.add(idx)
+            # Index the blocks' representative points once and query every influence
+            # circle against the tree in a single call
+            rep_indices = np.flatnonzero(block_nonempty)
+            rep_tree = shapely.STRtree(block_rep_points[rep_indices])
+            influences = shapely.buffer(
+                shapely.points([spec["center"] for spec in roundabout_specs]),
+                [spec["radius"] * 1.35 for spec in roundabout_specs],
+                quad_segs=16
+            )
+            _, hits = rep_tree.query(influences, predicate="contains")
+            reserved_block_indices = frozenset(rep_indices[hits].tolist())
+        reserved_mask = np.zeros(len(block_array), dtype=bool)
+        reserved_mask[list(reserved_block_indices)] = True
 
         amenity_overlays = []
         amenity_block_map = {}
@@ -9296,7 +9677,17 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
                 num_blocks_x=num_blocks_x,
                 num_blocks_y=num_blocks_y
             )
-            amenity_block_map = {overlay["block_index"]: overlay for overlay in amenity_overlays}
+            # One pass builds the block lookup and the per-type amenity counts
+            amenity_counter = Counter()
+            for overlay in amenity_overlays:
+                amenity_block_map[overlay["block_index"]] = overlay
+                amenity_counter[overlay["label"].upper()] += 1
+            if amenity_overlays:
+                marla_accounting["amenity_counts"] = {
+                    "MOSQUE": amenity_counter.get("MOSQUE", 0),
+                    "HOSPITAL": amenity_counter.get("HOSPITAL", 0),
+                    "SCHOOL": amenity_counter.get("SCHOOL", 0)
+                }
 
         colors = {
             'residential': '#FA8072',  # Salmon/coral like Zameen.com Al Rehman Garden
@@ -9323,32 +9714,102 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
         }
         
         # Count blocks by type for verification
-        commercial_count = sum(1 for bt in block_types if bt == 'commercial')
-        residential_count = sum(1 for bt in block_types if bt == 'residential')
-        park_count = sum(1 for bt in block_types if bt == 'park')
+        commercial_count = block_type_counts['commercial']
+        residential_count = block_type_counts['residential']
+        park_count = block_type_counts['park']
         logger.info(f"🔍 Block type counts before rendering: {residential_count} residential, {commercial_count} commercial, {park_count} park")
         if commercial_count == 0:
             logger.warning(f"⚠️ WARNING: No commercial blocks found! Check block distribution logic.")
         
+        # Block areas (layout units -> real-world square meters -> marla), the shrunken
+        # geometry actually drawn for each block and its bounds, in batched shapely calls
+        block_area_sqm_arr = shapely.area(block_array) * scale_factor_sq
+        block_area_marla_arr = block_area_sqm_arr / SQM_PER_MARLA
+        # Reserved (roundabout) blocks are never drawn, so only the others are shrunk
+        drawn_blocks = block_nonempty & ~reserved_mask
+        render_geoms = block_array.copy()
+        shrink_distance = road_width * 0.6
+        if shrink_distance > 0:
+            shrunken = np.full(len(block_array), None, dtype=object)
+            shrunken[drawn_blocks] = shapely.buffer(block_array[drawn_blocks], -shrink_distance)
+            keep_shrunken = drawn_blocks.copy()
+            keep_shrunken[drawn_blocks] = ~shapely.is_empty(shrunken[drawn_blocks])
+            render_geoms[keep_shrunken] = shrunken[keep_shrunken]
+        render_bounds = shapely.bounds(render_geoms).tolist()
+        render_area_arr = shapely.area(render_geoms)
+        render_area_marla_arr = render_area_arr * scale_factor_sq / SQM_PER_MARLA
+        
+        # Plot size mixes depend only on the polygon area, so look them up once for all blocks
+        # CDA Standard: Only 20, 15, 7, and 5 marla plots
+        residential_plot_sizes, _ = get_mixed_plot_sizes(area_acres, 'residential')
+        if not residential_plot_sizes:
+            residential_plot_sizes = ['20 MARLA', '15 MARLA', '7 MARLA', '5 MARLA']  # CDA Standard sizes only
+        commercial_plot_sizes, _ = get_mixed_plot_sizes(area_acres, 'commercial')
+        if not commercial_plot_sizes:
+            commercial_plot_sizes = ['SHOP', 'STORE', 'MALL', 'RETAIL', 'SHOP']
+        
+        # Target plot area in layout units for each standard CDA marla size
+        layout_area_by_marla = {
+            marla: marla * SQM_PER_MARLA / scale_factor_sq for marla in _MARLA_BY_LABEL.values()
+        } if scale_factor_sq > 0 else {}
+        
+        # Zone area totals for the CDA distribution check
+        # CDA Rules: 50% Residential, 30% Commercial, 20% Green (Parks + Amenities)
+        total_residential_area_sqm = 0
+        total_commercial_area_sqm = 0
+        total_park_area_sqm = 0
+        total_amenity_area_sqm = 0  # Amenities are part of green space per CDA rules
+        
+        # Loop-invariant label sizes and colours
+        amenity_label_fontsize = label_sizes["block"]
+        marla_label_fontsize = max(5, min(7, label_sizes["residential_plot"]))
+        shop_label_fontsize = label_sizes["commercial_plot"]
+        shop_label_color = plot_color_settings['commercial']['text']
+        park_label_fontsize = label_sizes["park"]
+        
+        # Block background rings with their per-block style, drawn as one collection
+        block_fill_rings = []
+        block_fill_facecolors = []
+        block_fill_edgecolors = []
+        block_fill_linewidths = []
+        residential_plot_rings = []
+        commercial_plot_rings = []
+        residential_plot_counts = []  # Non-empty plots per residential block
+        residential_plot_targets = []  # Target marla per residential block
+        commercial_plot_areas = []  # Layout areas of the non-empty plots, per commercial block
+        small_plot_number_labels = []  # (x, y, text) per residential plot in 5/7 marla blocks
+        large_plot_number_labels = []  # (x, y, text) per residential plot in larger blocks
+        commercial_plot_number_labels = []
+        
         for idx, (block_geom, block_type) in enumerate(zip(block_polygons, block_types)):
-            if block_geom.is_empty:
+            if not block_nonempty[idx]:
                 continue
-            # Convert block area from layout coordinates to real-world square meters
-            block_area_layout_sq = block_geom.area  # layout units squared
-            block_area_sqm = block_area_layout_sq * scale_factor_sq  # real-world square meters
-            block_area_marla = block_area_sqm / SQM_PER_MARLA
-            if idx in reserved_block_indices:
-                marla_accounting["reserved_marla"] += block_area_marla
+            if reserved_mask[idx]:
+                marla_accounting["reserved_marla"] += float(block_area_marla_arr[idx])
                 continue
 
-            render_geom = block_geom
-            shrink_distance = road_width * 0.6
-            if shrink_distance > 0:
-                shrunken = block_geom.buffer(-shrink_distance)
-                if not shrunken.is_empty:
-                    render_geom = shrunken
+            block_area_sqm = float(block_area_sqm_arr[idx])
+            # Check if this block has an amenity overlay (amenities count as green space per CDA)
+            if idx in amenity_block_map:
+                # Amenity blocks are counted as green space, not their original zone type
+                amenity_geom = amenity_block_map[idx]["geometry"]
+                if hasattr(amenity_geom, 'area'):
+                    amenity_area_sqm = amenity_geom.area * scale_factor_sq
+                else:
+                    # Fallback: use block area if geometry doesn't have area
+                    amenity_area_sqm = block_area_sqm
+                total_amenity_area_sqm += amenity_area_sqm
+                # Amenities are part of green space (20% total), so add to park/green area
+                total_park_area_sqm += amenity_area_sqm
+            elif block_type == 'residential':
+                total_residential_area_sqm += block_area_sqm
+            elif block_type == 'commercial':
+                total_commercial_area_sqm += block_area_sqm
+            elif block_type == 'park':
+                total_park_area_sqm += block_area_sqm
 
-            min_bx, min_by, max_bx, max_by = render_geom.bounds
+            render_geom = render_geoms[idx]
+            min_bx, min_by, max_bx, max_by = render_bounds[idx]
             block_w = max(max_bx - min_bx, 1e-3)
             block_h = max(max_by - min_by, 1e-3)
 
@@ -9383,11 +9844,7 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
             else:
                 if block_type == 'park':
                     # Use render_geom area (what's actually displayed) to match visualization
-                    # Calculate after shrink is applied
-                    render_area_layout_sq = render_geom.area
-                    render_area_sqm = render_area_layout_sq * scale_factor_sq
-                    park_marla = render_area_sqm / SQM_PER_MARLA
-                    marla_accounting["park_marla"] += park_marla
+                    marla_accounting["park_marla"] += float(render_area_marla_arr[idx])
                 block_color = colors.get(block_type, '#e5e7eb')
                 slope_warning = None
             
@@ -9397,16 +9854,14 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
                 # For non-commercial blocks, use amenity color
                 block_color = amenity_overlay["color"]
             
-            # Always draw the block background first (especially important for commercial)
-            draw_geometry(
-                ax,
-                render_geom,
-                facecolor=block_color,
-                edgecolor=border_colors[block_type],
-                linewidth=3 if block_type == 'commercial' else 2,  # Thicker border for commercial
-                alpha=0.9 if block_type == 'commercial' else 0.85,  # More opaque for commercial visibility
-                zorder=2  # Lower zorder so plots appear on top
-            )
+            # Always draw the block background first (especially important for commercial);
+            # the backgrounds go out as one collection after the block loop
+            block_alpha = 0.9 if block_type == 'commercial' else 0.85  # More opaque for commercial visibility
+            for ring in _exterior_rings([render_geom]):
+                block_fill_rings.append(ring)
+                block_fill_facecolors.append(to_rgba(block_color, block_alpha))
+                block_fill_edgecolors.append(to_rgba(border_colors[block_type], block_alpha))
+                block_fill_linewidths.append(3 if block_type == 'commercial' else 2)  # Thicker border for commercial
             
             # If this is a commercial block with an amenity, draw amenity overlay on top
             if amenity_overlay and block_type == 'commercial':
@@ -9422,55 +9877,47 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
                         zorder=3  # Above block but below plots
                     )
             
-            row = idx // num_blocks_x
-            col = idx % num_blocks_x
-            label_letter = chr(65 + (col % 26))
-            label_suffix = row + 1 + (col // 26) * num_blocks_y
-            block_label = f"Block {label_letter}{label_suffix}"
-            
-            # Clean block labels without slope warnings (warnings shown in terrain bar only)
-            label_color = 'black'
-            label_bg = 'white'
+            # Grid position, used for the per-block plot size seeds
+            row, col = divmod(idx, num_blocks_x)
 
             label_x, label_y = get_label_point(render_geom)
             
             # Only show amenity labels, no block labels for other types
             if amenity_overlay:
                 amenity_text = ax.text(label_x, label_y,
-                                     amenity_overlay["label"], ha='center', va='center', fontsize=label_sizes["block"], fontweight='bold',
+                                     amenity_overlay["label"], ha='center', va='center', fontsize=amenity_label_fontsize, fontweight='bold',
                                      color=amenity_overlay["text"],
                                      bbox=dict(boxstyle="round,pad=0.3", facecolor=amenity_overlay["color"], edgecolor='black', linewidth=1.5, alpha=0.9))
     
             # Add plots to blocks - EXACT layout from image
             if amenity_overlay:
                 continue
+            # No plot fits in a block smaller than the smallest plot size: keep just the
+            # block fill and book its area to the zone
+            if block_type in ('residential', 'commercial') and render_area_marla_arr[idx] < _MIN_PLOT_MARLA:
+                marla_accounting[f"{block_type}_marla"] += float(render_area_marla_arr[idx])
+                continue
             if block_type == 'residential':
                 # Get mixed plot sizes for variety across blocks
                 # Use deterministic seed based on block position to assign different sizes to different blocks
-                import random
                 block_seed = int(area_sqm + row * 100 + col * 50 + mean_slope * 5 + flood_risk * 100) % 10000
-                random.seed(block_seed)
-                
-                # Always get the full mixed list (not block-specific single size)
-                # CDA Standard: Only 20, 15, 7, and 5 marla plots
-                plot_sizes, _ = get_mixed_plot_sizes(area_acres, 'residential')
-                if not plot_sizes:
-                    plot_sizes = ['20 MARLA', '15 MARLA', '7 MARLA', '5 MARLA']  # CDA Standard sizes only
+                block_rng = random.Random(block_seed)
                 
                 # Assign different plot size to each block for realistic variety
-                plot_size = random.choice(plot_sizes) if plot_sizes else '5 MARLA'
+                plot_size = block_rng.choice(residential_plot_sizes)
                 
                 # Extract target marla from plot_size label (e.g., "20 MARLA" -> 20)
-                target_marla = extract_marla_from_plot_size(plot_size)
+                target_marla = _MARLA_BY_LABEL.get(plot_size) or extract_marla_from_plot_size(plot_size)
                 if target_marla <= 0:
                     target_marla = 5.0  # Default to 5 marla if can't parse
                 
                 # Calculate target plot area in layout units
-                target_plot_area_sqm = target_marla * SQM_PER_MARLA
-                target_plot_area_layout = target_plot_area_sqm / scale_factor_sq if scale_factor_sq > 0 else 0
+                target_plot_area_layout = layout_area_by_marla.get(target_marla)
+                if target_plot_area_layout is None:
+                    target_plot_area_layout = target_marla * SQM_PER_MARLA / scale_factor_sq if scale_factor_sq > 0 else 0
                 
                 # Calculate how many plots of target size can fit in this block
-                block_area_layout = render_geom.area
+                block_area_layout = float(render_area_arr[idx])
                 if target_plot_area_layout > 0:
                     target_plots_count = max(1, int(block_area_layout / target_plot_area_layout))
                 else:
@@ -9487,76 +9934,40 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
                 
                 # Fine-tune to match target count while maintaining minimum rows for 5/7 marla
                 if rows * cols != target_plots_count:
-                    # Adjust to get closer to target
-                    if rows * cols < target_plots_count:
-                        # Need more plots - increase grid
-                        while rows * cols < target_plots_count and (rows < 20 or cols < 20):
-                            if render_geom.bounds[2] - render_geom.bounds[0] > render_geom.bounds[3] - render_geom.bounds[1]:
-                                cols += 1
-                            else:
-                                rows += 1
-                    else:
-                        # Need fewer plots - decrease grid (but maintain min 3 rows for 5/7 marla)
-                        min_rows_for_block = 3 if target_marla in [5.0, 7.0] else 1
-                        while rows * cols > target_plots_count and rows > min_rows_for_block and cols > 1:
-                            if rows > cols:
-                                rows -= 1
-                            else:
-                                cols -= 1
-                        # Ensure minimum rows after adjustment
-                        if target_marla in [5.0, 7.0] and rows < 3:
-                            rows = 3
-                            cols = max(2, int(target_plots_count / rows))
+                    min_rows_for_block = 3 if target_marla in [5.0, 7.0] else 1
+                    rows, cols = _fit_plot_grid(rows, cols, target_plots_count, max_bx - min_bx > max_by - min_by, min_rows_for_block)
+                    # Ensure minimum rows after adjustment
+                    if target_marla in [5.0, 7.0] and rows < 3:
+                        rows = 3
+                        cols = max(2, int(target_plots_count / rows))
                 
                 plots = subdivide_block_into_plots(render_geom, rows, cols)
-                palette = plot_color_settings['residential']
                 
                 # Draw plots with sequential numbering (left to right, top to bottom)
                 if len(plots) == 0:
-                    logger.warning(f"No plots created for residential block at row {row}, col {col}")
+                    logger.warning("No plots created for residential block at row %d, col %d", row, col)
                 else:
-                    logger.info(f"Drawing {len(plots)} plots for residential block (rows={rows}, cols={cols})")
-                
-                for plot_number, plot_geom in plots:
+                    logger.info("Drawing %d plots for residential block (rows=%d, cols=%d)", len(plots), rows, cols)
+                
+                plot_geoms = [plot_geom for _, plot_geom in plots]
+                plot_label_points = _label_points(plot_geoms)
+                # Track residential plot marlas (using target marla to match label)
+                # This ensures label matches reality: if block says "20 MARLA", each plot IS 20 marla
+                residential_plot_counts.append(len(plot_geoms) - int(shapely.is_empty(plot_geoms).sum()))
+                residential_plot_targets.append(target_marla)
+                # Plot numbers - very small font size for visibility
+                if target_marla in [5.0, 7.0]:
+                    plot_number_labels = small_plot_number_labels  # Very small for 5 and 7 marla
+                else:
+                    plot_number_labels = large_plot_number_labels  # Small for 10, 15, 20 marla
+                # Plot outlines, drawn with every other residential plot after the block loop
+                residential_plot_rings.extend(_exterior_rings(plot_geoms))
+                for (plot_number, plot_geom), (plot_label_x, plot_label_y) in zip(plots, plot_label_points):
                     if plot_geom.is_empty:
                         continue
                     
-                    # Use target marla from label (since plots are created to match that size)
-                    # This ensures label matches reality: if block says "20 MARLA", each plot IS 20 marla
-                    plot_marla = target_marla
-                    
-                    # Track residential plot marlas (using target marla to match label)
-                    marla_accounting["residential_marla"] += plot_marla
-                    marla_accounting["total_plots"]["residential"] += 1
-                    
-                    # Draw plot with light blue fill color (same for all residential plots)
-                    draw_geometry(
-                        ax,
-                        plot_geom,
-                        facecolor='#dbeafe',  # Light blue - same color for all residential plots (5, 7, 15, 20 marla)
-                        edgecolor='#93c5fd',  # Lighter blue borders for better visibility
-                        linewidth=0.8,  # Thinner, more professional borders
-                        alpha=1.0,  # Fully opaque
-                        zorder=10  # High zorder to appear above blocks
-                    )
-                    plot_label_x, plot_label_y = get_label_point(plot_geom)
-                    # Plot numbers - very small font size for visibility
-                    if target_marla in [5.0, 7.0]:
-                        plot_fontsize = max(2, min(3, label_sizes["residential_plot"] * 0.4))  # Very small for 5 and 7 marla
-                    else:
-                        plot_fontsize = max(3, min(4, label_sizes["residential_plot"] * 0.6))  # Small for 10, 15, 20 marla
-                    
-                    ax.text(
-                        plot_label_x,
-                        plot_label_y,
-                        str(plot_number),
-                        ha='center',
-                        va='center',
-                        fontsize=plot_fontsize,
-                        fontweight='normal',  # Normal weight for cleaner look
-                        color='#1f2937',  # Dark gray instead of pure black for softer look
-                        zorder=15,  # Highest zorder for text
-                    )
+                    # Plot number, emitted with the other plot numbers after the block loop
+                    plot_number_labels.append((plot_label_x, plot_label_y, str(plot_number)))
                 
                 # Marla label - placed in the center of the block to avoid overlapping plot numbers
                 ax.text(
@@ -9565,7 +9976,7 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
                     plot_size,
                     ha='center',
                     va='center',
-                    fontsize=max(5, min(7, label_sizes["residential_plot"])),  # Normal font size
+                    fontsize=marla_label_fontsize,  # Normal font size
                     fontweight='normal',  # Normal weight for cleaner look
                     color='#1f2937',  # Dark gray for softer professional appearance
                     zorder=15  # High zorder for text
@@ -9574,64 +9985,32 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
             elif block_type == 'commercial':
                 # Get mixed plot sizes for variety across commercial blocks
                 # Use deterministic seed based on block position to assign different sizes to different blocks
-                import random
                 commercial_seed = int(area_sqm + row * 200 + col * 75 + mean_slope * 8 + flood_risk * 150) % 10000
-                random.seed(commercial_seed)
-                
-                # Always get the full mixed list for variety
-                plot_sizes, _ = get_mixed_plot_sizes(area_acres, 'commercial')
-                if not plot_sizes:
-                    plot_sizes = ['SHOP', 'STORE', 'MALL', 'RETAIL', 'SHOP']
+                block_rng = random.Random(commercial_seed)
                 
                 # Assign different plot size to each block for realistic variety
-                shop_type = random.choice(plot_sizes) if plot_sizes else 'SHOP'
+                shop_type = block_rng.choice(commercial_plot_sizes)
                 rows, cols = determine_plot_grid(render_geom, 'commercial', area_acres, total_blocks)
                 plots = subdivide_block_into_plots(render_geom, rows, cols)
-                palette = plot_color_settings['commercial']
                 
                 # Draw commercial plots with sequential numbering
                 if len(plots) == 0:
-                    logger.warning(f"No plots created for commercial block at row {row}, col {col}")
+                    logger.warning("No plots created for commercial block at row %d, col %d", row, col)
                 else:
-                    logger.info(f"Drawing {len(plots)} plots for commercial block (rows={rows}, cols={cols})")
-                
-                for plot_number, plot_geom in plots:
+                    logger.info("Drawing %d plots for commercial block (rows=%d, cols=%d)", len(plots), rows, cols)
+                
+                plot_geoms = [plot_geom for _, plot_geom in plots]
+                plot_label_points = _label_points(plot_geoms)
+                # Track commercial plot marlas from ACTUAL plot area (to match visualization exactly)
+                commercial_plot_areas.append(shapely.area(plot_geoms)[~shapely.is_empty(plot_geoms)])
+                # Plot outlines, drawn with every other commercial plot after the block loop
+                commercial_plot_rings.extend(_exterior_rings(plot_geoms))
+                for (plot_number, plot_geom), (plot_label_x, plot_label_y) in zip(plots, plot_label_points):
                     if plot_geom.is_empty:
                         continue
-                    # Calculate individual plot marla from ACTUAL plot area (to match visualization exactly)
-                    # Convert plot area from layout coordinates to real-world square meters, then to marla
-                    plot_area_layout_sq = plot_geom.area
-                    plot_area_sqm = plot_area_layout_sq * scale_factor_sq
-                    plot_marla = plot_area_sqm / SQM_PER_MARLA
-                    
-                    # Track commercial plot marlas (using actual area, not label, to match visualization)
-                    marla_accounting["commercial_marla"] += plot_marla
-                    marla_accounting["total_plots"]["commercial"] += 1
                     
-                    # Draw commercial plot with clear borders
-                    draw_geometry(
-                        ax,
-                        plot_geom,
-                        facecolor=palette['fill'],
-                        edgecolor='#000000',  # Black borders for maximum visibility
-                        linewidth=2.0,  # Thicker borders for clear separation
-                        alpha=1.0,  # Fully opaque
-                        zorder=10  # High zorder to appear above blocks
-                    )
-                    plot_label_x, plot_label_y = get_label_point(plot_geom)
-                    # Plot numbers - clear and visible
-                    ax.text(
-                        plot_label_x,
-                        plot_label_y,
-                        str(plot_number),
-                        ha='center',
-                        va='center',
-                        fontsize=max(9, label_sizes["commercial_plot"]),  # Larger, more readable
-                        fontweight='bold',
-                        color='#000000',  # Black text for maximum visibility
-                        zorder=15,  # Highest zorder for text
-                        bbox=dict(boxstyle="round,pad=0.2", facecolor='white', edgecolor='black', linewidth=0.5, alpha=0.9)
-                    )
+                    # Plot number, emitted with the other plot numbers after the block loop
+                    commercial_plot_number_labels.append((plot_label_x, plot_label_y, str(plot_number)))
                 
                 ax.text(
                     label_x,
@@ -9639,9 +10018,9 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
                     shop_type,
                     ha='center',
                     va='center',
-                    fontsize=label_sizes["commercial_plot"],
+                    fontsize=shop_label_fontsize,
                     fontweight='bold',
-                    color=palette['text']
+                    color=shop_label_color
                 )
             
             elif block_type == 'park':
@@ -9656,35 +10035,100 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
                 )
                 
                 # PROFESSIONAL park label from image
-                center_x, center_y = get_label_point(block_geom)
+                center_x, center_y = float(block_rep_x[idx]), float(block_rep_y[idx])
                 park_text = ax.text(center_x, center_y, "PARK", ha='center', va='center', 
-                       fontsize=label_sizes["park"], fontweight='bold', color='white',
-                       bbox=dict(boxstyle="round,pad=0.2", facecolor='black', alpha=0.3, edgecolor='white', linewidth=1.5))
+                       fontsize=park_label_fontsize, fontweight='bold', color='white',
+                       bbox=_BBOX_PARK_LABEL)
+        
+        # Block backgrounds below the plots (zorder 2), in block order
+        if block_fill_rings:
+            ax.add_collection(PolyCollection(
+                block_fill_rings,
+                closed=True,
+                facecolors=block_fill_facecolors,
+                edgecolors=block_fill_edgecolors,
+                linewidths=block_fill_linewidths,
+                joinstyle='miter',  # Same joins as patches.Polygon
+                zorder=2
+            ))
+        
+        # Plot marla totals in one reduction per zone
+        if residential_plot_counts:
+            residential_plot_counts = np.array(residential_plot_counts)
+            marla_accounting["residential_marla"] += float(np.dot(residential_plot_counts, residential_plot_targets))
+            marla_accounting["total_plots"]["residential"] += int(residential_plot_counts.sum())
+        if commercial_plot_areas:
+            # Convert plot areas from layout coordinates to real-world square meters, then to marla
+            commercial_plot_areas = np.concatenate(commercial_plot_areas)
+            marla_accounting["commercial_marla"] += float((commercial_plot_areas * scale_factor_sq / SQM_PER_MARLA).sum())
+            marla_accounting["total_plots"]["commercial"] += len(commercial_plot_areas)
+        
+        # Plots go out as one collection per style, above the blocks (zorder 10)
+        if residential_plot_rings:
+            ax.add_collection(PolyCollection(
+                residential_plot_rings,
+                closed=True,
+                facecolors='#dbeafe',  # Light blue - same color for all residential plots (5, 7, 15, 20 marla)
+                edgecolors='#93c5fd',  # Lighter blue borders for better visibility
+                linewidths=0.8,  # Thinner, more professional borders
+                joinstyle='miter',  # Same joins as patches.Polygon
+                alpha=1.0,  # Fully opaque
+                zorder=10
+            ))
+        if commercial_plot_rings:
+            ax.add_collection(PolyCollection(
+                commercial_plot_rings,
+                closed=True,
+                facecolors=plot_color_settings['commercial']['fill'],
+                edgecolors='#000000',  # Black borders for maximum visibility
+                linewidths=2.0,  # Thicker borders for clear separation
+                joinstyle='miter',  # Same joins as patches.Polygon
+                alpha=1.0,  # Fully opaque
+                zorder=10
+            ))
+        
+        # Plot numbers in one pass per style, with the text settings built once
+        residential_number_style = {
+            "ha": 'center',
+            "va": 'center',
+            "fontweight": 'normal',  # Normal weight for cleaner look
+            "color": '#1f2937',  # Dark gray instead of pure black for softer look
+            "zorder": 15,  # Highest zorder for text
+        }
+        commercial_number_style = {
+            "ha": 'center',
+            "va": 'center',
+            "fontsize": max(9, label_sizes["commercial_plot"]),  # Larger, more readable
+            "fontweight": 'bold',
+            "color": '#000000',  # Black text for maximum visibility
+            "zorder": 15,  # Highest zorder for text
+            "bbox": _BBOX_PLOT_NUMBER,
+        }
+        small_number_fontsize = max(2, min(3, label_sizes["residential_plot"] * 0.4))
+        large_number_fontsize = max(3, min(4, label_sizes["residential_plot"] * 0.6))
+        for plot_label_x, plot_label_y, plot_text in small_plot_number_labels:
+            ax.text(plot_label_x, plot_label_y, plot_text, fontsize=small_number_fontsize, **residential_number_style)
+        for plot_label_x, plot_label_y, plot_text in large_plot_number_labels:
+            ax.text(plot_label_x, plot_label_y, plot_text, fontsize=large_number_fontsize, **residential_number_style)
+        for plot_label_x, plot_label_y, plot_text in commercial_plot_number_labels:
+            ax.text(plot_label_x, plot_label_y, plot_text, **commercial_number_style)
         
         if amenity_overlays:
-            amenity_counter = Counter()
-            for overlay in amenity_overlays:
-                amenity_counter[overlay["label"].upper()] += 1
-            marla_accounting["amenity_counts"] = {
-                "MOSQUE": amenity_counter.get("MOSQUE", 0),
-                "HOSPITAL": amenity_counter.get("HOSPITAL", 0),
-                "SCHOOL": amenity_counter.get("SCHOOL", 0)
-            }
             draw_amenity_overlays(ax, amenity_overlays, label_sizes, clip_polygon_patch, draw_geometry, get_label_point)
 
-        # Draw soft internal roads by outlining each block boundary
-        for idx, geom in enumerate(block_polygons):
-            if idx in reserved_block_indices:
-                continue
-            if geom.is_empty:
-                continue
-            boundary = geom.boundary
-            boundaries = list(boundary.geoms) if hasattr(boundary, "geoms") else [boundary]
-            for line in boundaries:
-                if line.is_empty:
-                    continue
-                x, y = line.xy
-                ax.plot(x, y, color='#94a3b8', linewidth=1.2, alpha=0.6)
+        # Draw soft internal roads by outlining each block boundary, all as one collection
+        boundary_lines = shapely.get_parts(shapely.boundary(block_array[drawn_blocks]))
+        boundary_lines = boundary_lines[~shapely.is_empty(boundary_lines)]
+        if len(boundary_lines):
+            boundary_coords, line_index = shapely.get_coordinates(boundary_lines, return_index=True)
+            ax.add_collection(LineCollection(
+                np.split(boundary_coords, np.flatnonzero(np.diff(line_index)) + 1),
+                colors='#94a3b8',
+                linewidths=1.2,
+                alpha=0.6,
+                capstyle='projecting',  # Same caps and joins as ax.plot lines
+                joinstyle='round'
+            ))
 
         # Draw all planned roundabouts
         for spec in roundabout_specs:
@@ -9694,43 +10138,14 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
                 spec["radius"],
                 clip_path=clip_polygon_patch
             )
-            # Roundabout radius is in layout units, convert to real-world meters
-            roundabout_radius_sqm = (spec["radius"] ** 2) * scale_factor_sq
-            marla_accounting["roundabout_surface_marla"] += math.pi * roundabout_radius_sqm / SQM_PER_MARLA
 
-        # Calculate actual zone areas from blocks to verify CDA area distribution
-        # CDA Rules: 50% Residential, 30% Commercial, 20% Green (Parks + Amenities)
-        total_residential_area_sqm = 0
-        total_commercial_area_sqm = 0
-        total_park_area_sqm = 0
-        total_amenity_area_sqm = 0  # Amenities are part of green space per CDA rules
-        
-        for idx, (block_geom, block_type) in enumerate(zip(block_polygons, block_types)):
-            if idx in reserved_block_indices or block_geom.is_empty:
-                continue
-            block_area_layout_sq = block_geom.area
-            block_area_sqm = block_area_layout_sq * scale_factor_sq
-            
-            # Check if this block has an amenity overlay (amenities count as green space per CDA)
-            if idx in amenity_block_map:
-                # Amenity blocks are counted as green space, not their original zone type
-                amenity_geom = amenity_block_map[idx]["geometry"]
-                if hasattr(amenity_geom, 'area'):
-                    amenity_area_layout_sq = amenity_geom.area
-                else:
-                    # Fallback: use block area if geometry doesn't have area
-                    amenity_area_layout_sq = block_area_layout_sq
-                amenity_area_sqm = amenity_area_layout_sq * scale_factor_sq
-                total_amenity_area_sqm += amenity_area_sqm
-                # Amenities are part of green space (20% total), so add to park/green area
-                total_park_area_sqm += amenity_area_sqm
-            elif block_type == 'residential':
-                total_residential_area_sqm += block_area_sqm
-            elif block_type == 'commercial':
-                total_commercial_area_sqm += block_area_sqm
-            elif block_type == 'park':
-                total_park_area_sqm += block_area_sqm
-        
+        if roundabout_specs:
+            # Roundabout radii are in layout units, convert to real-world meters
+            roundabout_radii = np.array([spec["radius"] for spec in roundabout_specs])
+            roundabout_radius_sqm = (roundabout_radii ** 2) * scale_factor_sq
+            marla_accounting["roundabout_surface_marla"] += float((np.pi * roundabout_radius_sqm / SQM_PER_MARLA).sum())
+
+        # Verify the CDA area distribution from the zone totals gathered in the block loop
         # Calculate percentages based on actual polygon area (CDA: 50% residential, 30% commercial, 20% green)
         total_zoned_area_sqm = total_residential_area_sqm + total_commercial_area_sqm + total_park_area_sqm
         residential_percentage = (total_residential_area_sqm / area_sqm * 100) if area_sqm > 0 else 0
@@ -9798,13 +10213,13 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
             fontsize=9,
             fontweight='bold',
             color='#1f2937',
-            bbox=dict(boxstyle="round,pad=0.25", facecolor='#fef3c7', edgecolor='#d97706', linewidth=1.5)
+            bbox=_BBOX_SUMMARY
         )
         zoning_data["marla_summary"] = marla_accounting
         logger.info(f"📊 Marla accounting summary: {json.dumps(marla_accounting, default=float)}")
         
         # Calculate green space statistics from 2D visualization
-        park_block_count = sum(1 for bt in block_types if bt == 'park')
+        park_block_count = block_type_counts['park']
         amenity_count = len(amenity_block_map)
         total_green_space_count = park_block_count + amenity_count  # Parks + amenities
         
@@ -9844,11 +10259,11 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
         # Add boulevard labels ABOVE the map (no overlapping rectangles)
         ax.text(layout_center_x, 11.6, "SUNSET BOULEVARD (250' WIDE)", 
                ha='center', va='center', fontsize=label_sizes["boulevard"], fontweight='bold', color='#374151',
-               bbox=dict(boxstyle="round,pad=0.25", facecolor='#e0f2fe', edgecolor='black', linewidth=1.5))
+               bbox=_BBOX_MAP_LABEL)
         
         ax.text(max_x + 0.5, start_y + height/2, "COMMERCIAL BOULEVARD (250' WIDE)", 
                ha='center', va='center', fontsize=label_sizes["boulevard"], fontweight='bold', rotation=90, color='#374151',
-               bbox=dict(boxstyle="round,pad=0.25", facecolor='#e0f2fe', edgecolor='black', linewidth=1.5))
+               bbox=_BBOX_MAP_LABEL)
         
         # Add legend positioned OUTSIDE the map area
         legend_x = max_x + 1.2
@@ -9872,12 +10287,18 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
             ('Road Network', '#9ca3af', 'black')
         ]
         
+        legend_rects = []
         for i, (label, color, border) in enumerate(legend_items):
             y_pos = legend_y - 0.5 - i * 0.3
-            legend_rect = patches.Rectangle((legend_x + 0.1, y_pos - 0.1), 0.2, 0.2,
-                                          facecolor=color, edgecolor=border, linewidth=2)
-            ax.add_patch(legend_rect)
+            legend_rects.append(patches.Rectangle((legend_x + 0.1, y_pos - 0.1), 0.2, 0.2))
             ax.text(legend_x + 0.4, y_pos, label, ha='left', va='center', fontsize=label_sizes["legend_item"], fontweight='bold', color='#374151')
+        ax.add_collection(PatchCollection(
+            legend_rects,
+            facecolors=[color for _, color, _ in legend_items],
+            edgecolors=[border for _, _, border in legend_items],
+            linewidths=2,
+            joinstyle='miter'
+        ))
         
         # Add PROFESSIONAL north arrow positioned OUTSIDE the map area
         north_x = max_x + 2.5
@@ -9887,7 +10308,7 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
                                       arrowstyle='->', mutation_scale=20, color='black', linewidth=3)
         ax.add_patch(arrow)
         ax.text(north_x, north_y, "N", ha='center', va='center', fontsize=label_sizes["north"], fontweight='bold', color='black',
-               bbox=dict(boxstyle="round,pad=0.25", facecolor='#e0f2fe', edgecolor='black', linewidth=1.5))
+               bbox=_BBOX_MAP_LABEL)
         
         # Add PROFESSIONAL scale bar positioned to use full space
         scale_x = 0.5
@@ -9899,7 +10320,7 @@ def create_2d_zoning_visualization(polygon_coords, zoning_data, output_path=None
         ax.plot([scale_x + scale_length, scale_x + scale_length], [scale_y - 0.1, scale_y + 0.1], 'k-', linewidth=3)
         ax.text(scale_x + scale_length/2, scale_y - 0.2, "1m", ha='center', va='center', 
                fontsize=label_sizes["scale"], fontweight='bold', color='black',
-               bbox=dict(boxstyle="round,pad=0.15", facecolor='#e0f2fe', edgecolor='black', linewidth=1.5))
+               bbox=_BBOX_SCALE_LABEL)
         
         # Add branding and polygon info footer
         polygon_id = zoning_data.get('polygon_id', 'N/A')
@@ -10047,45 +10468,11 @@ def create_2d_zoning_visualization_svg(polygon_coords, zoning_data, output_path=
         # Helper to extract marla
         def extract_marla_from_plot_size(plot_size_str):
             if isinstance(plot_size_str, str):
-                import re
-                match = re.search(r'(\d+(?:\.\d+)?)\s*MARLA', plot_size_str.upper())
+                match = _MARLA_RE.search(plot_size_str)
                 if match:
                     return float(match.group(1))
             return 0.0
         
-        # Scale polygon to layout
-        def scale_polygon_to_layout(coords_array, target_width, target_height, offset_x, offset_y, padding_ratio=0.05):
-            if coords_array is None or coords_array.size == 0:
-                return coords_array
-            
-            xs = coords_array[:, 0]
-            ys = coords_array[:, 1]
-            min_geo_x, max_geo_x = xs.min(), xs.max()
-            min_geo_y, max_geo_y = ys.min(), ys.max()
-            
-            geo_width = max_geo_x - min_geo_x
-            geo_height = max_geo_y - min_geo_y
-            if geo_width == 0:
-                geo_width = 1e-6
-            if geo_height == 0:
-                geo_height = 1e-6
-            
-            padding_x = target_width * padding_ratio
-            padding_y = target_height * padding_ratio
-            available_width = max(target_width - 2 * padding_x, 1e-3)
-            available_height = max(target_height - 2 * padding_y, 1e-3)
-            scale = min(available_width / geo_width, available_height / geo_height)
-            
-            scaled_width = geo_width * scale
-            scaled_height = geo_height * scale
-            extra_x = (available_width - scaled_width) / 2
-            extra_y = (available_height - scaled_height) / 2
-            
-            scaled_x = offset_x + padding_x + extra_x + (xs - min_geo_x) * scale
-            scaled_y = offset_y + padding_y + extra_y + (ys - min_geo_y) * scale
-            
-            return np.column_stack((scaled_x, scaled_y))
-        
         # Marla accounting
         marla_accounting = {
             "total_polygon_marla": total_marla,
@@ -10164,7 +10551,7 @@ def create_2d_zoning_visualization_svg(polygon_coords, zoning_data, output_path=
         num_blocks_y = max(3, int(np.sqrt(num_blocks / aspect_ratio)))
         num_blocks_x = max(3, int(num_blocks / num_blocks_y))
         
-        while num_blocks_x * num_blocks_y < num_blocks and num_blocks_x * num_blocks_y < 500:
+        if num_blocks_x * num_blocks_y < num_blocks:
             if num_blocks_x <= num_blocks_y:
                 num_blocks_x += 1
             else:
@@ -10197,10 +10584,11 @@ def create_2d_zoning_visualization_svg(polygon_coords, zoning_data, output_path=
             num_blocks_x,
             num_blocks_y
         )
-        block_types = [zone for row in block_layout for zone in row]
+        block_types = list(chain.from_iterable(block_layout))
+        block_type_counts = Counter(block_types)
         
-        # Generate amenities
-        reserved_block_indices = set()
+        # Generate amenities (the SVG layout reserves no roundabout blocks)
+        reserved_block_indices = frozenset()
         amenity_overlays = []
         amenity_block_map = {}
         
@@ -10303,9 +10691,9 @@ def create_2d_zoning_visualization_svg(polygon_coords, zoning_data, output_path=
         # Draw blocks
         logger.info(f"🔍 Drawing {len(block_polygons)} blocks")
         
-        commercial_count = sum(1 for bt in block_types if bt == 'commercial')
-        residential_count = sum(1 for bt in block_types if bt == 'residential')
-        park_count = sum(1 for bt in block_types if bt == 'park')
+        commercial_count = block_type_counts['commercial']
+        residential_count = block_type_counts['residential']
+        park_count = block_type_counts['park']
         
         logger.info(f"🔍 Block counts: {residential_count} residential, {commercial_count} commercial, {park_count} parks")
         
@@ -10315,16 +10703,35 @@ def create_2d_zoning_visualization_svg(polygon_coords, zoning_data, output_path=
         total_park_area_sqm = 0
         total_amenity_area_sqm = 0
         
+        # Plot size mixes depend only on the polygon area, so look them up once for all blocks
+        residential_plot_sizes, _ = get_mixed_plot_sizes(area_acres, 'residential')
+        if not residential_plot_sizes:
+            residential_plot_sizes = ['20 MARLA', '15 MARLA', '7 MARLA', '5 MARLA']
+        commercial_plot_sizes, _ = get_mixed_plot_sizes(area_acres, 'commercial')
+        if not commercial_plot_sizes:
+            commercial_plot_sizes = ['SHOP', 'STORE', 'MALL', 'RETAIL', 'SHOP']
+        
+        # Shrink every drawn block for road spacing in one batched buffer
+        svg_block_array = np.asarray(block_polygons, dtype=object)
+        drawn_blocks = ~shapely.is_empty(svg_block_array)
+        render_geoms = svg_block_array.copy()
+        shrink_distance = road_width * 0.6
+        if shrink_distance > 0:
+            render_geoms[drawn_blocks] = shapely.buffer(svg_block_array[drawn_blocks], -shrink_distance)
+        # Real-world areas of the blocks and of their shrunken render geometry
+        block_area_sqm_arr = shapely.area(svg_block_array) * scale_factor_sq
+        render_area_sqm_arr = shapely.area(render_geoms) * scale_factor_sq
+        # Park label anchors on the unshrunken blocks, in one batched call
+        park_block_indices = np.flatnonzero(drawn_blocks & (np.asarray(block_types, dtype=object) == 'park'))
+        park_label_points = dict(zip(park_block_indices.tolist(), _label_points(svg_block_array[park_block_indices])))
+        
         for idx, (block_geom, block_type) in enumerate(zip(block_polygons, block_types)):
-            if block_geom.is_empty or idx in reserved_block_indices:
+            if not drawn_blocks[idx]:
                 continue
             
-            block_area_layout_sq = block_geom.area
-            block_area_sqm = block_area_layout_sq * scale_factor_sq
+            block_area_sqm = float(block_area_sqm_arr[idx])
             
-            # Shrink block for road spacing
-            shrink_distance = road_width * 0.6
-            render_geom = block_geom.buffer(-shrink_distance) if shrink_distance > 0 else block_geom
+            render_geom = render_geoms[idx]
             if render_geom.is_empty:
                 continue
             
@@ -10338,8 +10745,7 @@ def create_2d_zoning_visualization_svg(polygon_coords, zoning_data, output_path=
             elif block_type == 'commercial':
                 block_color = colors['commercial']
             elif block_type == 'park':
-                render_area_sqm = render_geom.area * scale_factor_sq
-                park_marla = render_area_sqm / SQM_PER_MARLA
+                park_marla = float(render_area_sqm_arr[idx]) / SQM_PER_MARLA
                 marla_accounting["park_marla"] += park_marla
                 block_color = colors['park']
                 if amenity_overlay:
@@ -10394,24 +10800,25 @@ def create_2d_zoning_visualization_svg(polygon_coords, zoning_data, output_path=
                 if amenity_name in marla_accounting["amenity_counts"]:
                     marla_accounting["amenity_counts"][amenity_name] += 1
             
+            # No plot fits in a block smaller than the smallest plot size: keep just the
+            # block fill and book its area to the zone
+            if not amenity_overlay and block_type in ('residential', 'commercial'):
+                render_area_marla = float(render_area_sqm_arr[idx]) / SQM_PER_MARLA
+                if render_area_marla < _MIN_PLOT_MARLA:
+                    marla_accounting[f"{block_type}_marla"] += render_area_marla
+                    continue
+            
             # Draw plots for residential and commercial blocks
             if not amenity_overlay:
                 if block_type == 'residential':
                     row = idx // num_blocks_x
                     col = idx % num_blocks_x
                     
-                    import random
                     block_seed = int(area_sqm + row * 100 + col * 50 + mean_slope * 5 + flood_risk * 100) % 10000
-                    random.seed(block_seed)
-                    
-                    # Functions are defined in this file, no import needed
+                    block_rng = random.Random(block_seed)
                     
-                    plot_sizes, _ = get_mixed_plot_sizes(area_acres, 'residential')
-                    if not plot_sizes:
-                        plot_sizes = ['20 MARLA', '15 MARLA', '7 MARLA', '5 MARLA']
-                    
-                    plot_size = random.choice(plot_sizes) if plot_sizes else '5 MARLA'
-                    target_marla = extract_marla_from_plot_size(plot_size)
+                    plot_size = block_rng.choice(residential_plot_sizes)
+                    target_marla = _MARLA_BY_LABEL.get(plot_size) or extract_marla_from_plot_size(plot_size)
                     if target_marla <= 0:
                         target_marla = 5.0
                     
@@ -10423,9 +10830,10 @@ def create_2d_zoning_visualization_svg(polygon_coords, zoning_data, output_path=
                     
                     plots = subdivide_block_into_plots(render_geom, rows, cols)
                     
-                    logger.info(f"Drawing {len(plots)} plots for residential block (rows={rows}, cols={cols})")
+                    logger.info("Drawing %d plots for residential block (rows=%d, cols=%d)", len(plots), rows, cols)
                     
-                    for plot_number, plot_geom in plots:
+                    plot_label_points = _label_points([plot_geom for _, plot_geom in plots])
+                    for (plot_number, plot_geom), (plot_label_x, plot_label_y) in zip(plots, plot_label_points):
                         if plot_geom.is_empty:
                             continue
                         
@@ -10444,7 +10852,6 @@ def create_2d_zoning_visualization_svg(polygon_coords, zoning_data, output_path=
                         )
                         
                         # Draw plot number
-                        plot_label_x, plot_label_y = get_label_point(plot_geom)
                         svg_x, svg_y = layout_to_svg(plot_label_x, plot_label_y)
                         
                         plot_fontsize = max(2, min(3, label_sizes["residential_plot"] * 0.4)) if target_marla in [5.0, 7.0] else max(3, min(4, label_sizes["residential_plot"] * 0.6))
@@ -10478,23 +10885,17 @@ def create_2d_zoning_visualization_svg(polygon_coords, zoning_data, output_path=
                     row = idx // num_blocks_x
                     col = idx % num_blocks_x
                     
-                    import random
                     commercial_seed = int(area_sqm + row * 200 + col * 75 + mean_slope * 8 + flood_risk * 150) % 10000
-                    random.seed(commercial_seed)
-                    
-                    # Functions are defined in this file, no import needed
+                    block_rng = random.Random(commercial_seed)
                     
-                    plot_sizes, _ = get_mixed_plot_sizes(area_acres, 'commercial')
-                    if not plot_sizes:
-                        plot_sizes = ['SHOP', 'STORE', 'MALL', 'RETAIL', 'SHOP']
-                    
-                    shop_type = random.choice(plot_sizes) if plot_sizes else 'SHOP'
+                    shop_type = block_rng.choice(commercial_plot_sizes)
                     rows, cols = determine_plot_grid(render_geom, 'commercial', area_acres, total_blocks)
                     plots = subdivide_block_into_plots(render_geom, rows, cols)
                     
-                    logger.info(f"Drawing {len(plots)} plots for commercial block (rows={rows}, cols={cols})")
+                    logger.info("Drawing %d plots for commercial block (rows=%d, cols=%d)", len(plots), rows, cols)
                     
-                    for plot_number, plot_geom in plots:
+                    plot_label_points = _label_points([plot_geom for _, plot_geom in plots])
+                    for (plot_number, plot_geom), (plot_label_x, plot_label_y) in zip(plots, plot_label_points):
                         if plot_geom.is_empty:
                             continue
                         
@@ -10515,7 +10916,6 @@ def create_2d_zoning_visualization_svg(polygon_coords, zoning_data, output_path=
                         )
                         
                         # Draw plot number with background
-                        plot_label_x, plot_label_y = get_label_point(plot_geom)
                         svg_x, svg_y = layout_to_svg(plot_label_x, plot_label_y)
                         
                         # Background rect for number
@@ -10555,7 +10955,7 @@ def create_2d_zoning_visualization_svg(polygon_coords, zoning_data, output_path=
                     )
                     
                     # Park label
-                    center_x, center_y = get_label_point(block_geom)
+                    center_x, center_y = park_label_points[idx]
                     svg_x, svg_y = layout_to_svg(center_x, center_y)
                     
                     # Background for text
@@ -10629,7 +11029,7 @@ def create_2d_zoning_visualization_svg(polygon_coords, zoning_data, output_path=
         logger.info(f"📊 Marla accounting: {json.dumps(marla_accounting, default=float)}")
         
         # Add green space statistics
-        park_block_count = sum(1 for bt in block_types if bt == 'park')
+        park_block_count = block_type_counts['park']
         amenity_count = len(amenity_block_map)
         
         zoning_data["green_space_statistics"] = {
@@ -11067,11 +11467,11 @@ async def land_subdivision(request: Request):
                     parcels_geojson = result.get("parcels", {})
                     parcel_features = parcels_geojson.get("features", []) or []
                     
-                    for feature in parcel_features:
+                    def build_parcel_payload(feature):
                         props = feature.get("properties", {})
                         geometry = feature.get("geometry", {})
                         
-                        parcel_data = {
+                        return {
                             "projectId": project_id,
                             "parcelNumber": props.get("parcel_id", f"P{len(parcel_features)}"),
                             "type": props.get("zone_type", "Residential"),
@@ -11090,38 +11490,50 @@ async def land_subdivision(request: Request):
                                 "subdivision_id": subdivision_record.get("id")
                             }
                         }
+                    
+                    # One keep-alive client for every parcel, with at most PARCEL_SAVE_CONCURRENCY
+                    # requests in flight so the connection pool never times out waiting
+                    import httpx
+                    node_backend_url = "http://127.0.0.1:8000"
+                    save_slots = asyncio.Semaphore(PARCEL_SAVE_CONCURRENCY)
+                    async with httpx.AsyncClient(
+                        base_url=node_backend_url,
+                        timeout=10.0,
+                        limits=httpx.Limits(max_connections=PARCEL_SAVE_CONCURRENCY, max_keepalive_connections=PARCEL_SAVE_CONCURRENCY)
+                    ) as client:
+                        async def save_parcel(parcel_data):
+                            # Save parcel via Node.js backend API
+                            async with save_slots:
+                                try:
+                                    save_response = await client.post("/api/design/parcels", json=parcel_data)
+                                    if save_response.status_code in [200, 201]:
+                                        logger.debug(f"✅ Saved parcel: {parcel_data['parcelNumber']}")
+                                        return True
+                                except Exception as save_err:
+                                    logger.warning(f"⚠️ Could not save parcel {parcel_data['parcelNumber']}: {save_err}")
+                                return False
                         
-                        # Save parcel via Node.js backend API
-                        try:
-                            import httpx
-                            async with httpx.AsyncClient() as client:
-                                node_backend_url = "http://127.0.0.1:8000"
-                                save_response = await client.post(
-                                    f"{node_backend_url}/api/design/parcels",
-                                    json=parcel_data,
-                                    headers={"Content-Type": "application/json"},
-                                    timeout=10.0
-                                )
-                                if save_response.status_code in [200, 201]:
-                                    logger.debug(f"✅ Saved parcel: {parcel_data['parcelNumber']}")
-                        except ImportError:
-                            try:
-                                import requests
-                                node_backend_url = "http://127.0.0.1:8000"
-                                save_response = requests.post(
-                                    f"{node_backend_url}/api/design/parcels",
-                                    json=parcel_data,
-                                    headers={"Content-Type": "application/json"},
-                                    timeout=10.0
-                                )
-                                if save_response.status_code in [200, 201]:
-                                    logger.debug(f"✅ Saved parcel: {parcel_data['parcelNumber']}")
-                            except:
-                                pass
-                        except Exception as save_err:
-                            logger.warning(f"⚠️ Could not save parcel {parcel_data['parcelNumber']}: {save_err}")
+                        parcel_payloads = [build_parcel_payload(feature) for feature in parcel_features]
+                        saved_count = 0
+                        if parcel_payloads:
+                            # All parcels in one batched insert. The bulk route answers 422 for an
+                            # unknown project, so a 404 only comes from backends without the route;
+                            # those get the per-parcel saves instead
+                            bulk_response = await client.post(
+                                "/api/design/parcels/bulk",
+                                json={"projectId": project_id, "parcels": parcel_payloads},
+                                timeout=30.0
+                            )
+                            if bulk_response.status_code in [200, 201]:
+                                saved_count = len(parcel_payloads)
+                            elif bulk_response.status_code == 404:
+                                saved = await asyncio.gather(*(save_parcel(parcel_data) for parcel_data in parcel_payloads))
+                                saved_count = sum(saved)
+                            else:
+                                logger.warning(f"⚠️ Bulk parcel save failed with status {bulk_response.status_code}: {bulk_response.text[:200]}")
                     
-                    logger.info(f"💾 Saved {len(parcel_features)} parcels to database for project {project_id}")
+                    if saved_count:
+                        logger.info(f"💾 Saved {saved_count} of {len(parcel_features)} parcels to database for project {project_id}")
             except Exception as save_error:
                 logger.warning(f"⚠️ Error saving parcels to database: {save_error}")
                 # Don't fail the request if saving fails
@@ -11137,12 +11549,14 @@ async def land_subdivision(request: Request):
             
             logger.info(f"📤 Serializing {len(result['parcels']['features'])} parcels to JSON...")
             try:
-                json_str = json.dumps(result, cls=CustomJSONEncoder, ensure_ascii=False)
+                # Same settings as JSONResponse (no NaN/Infinity, compact separators) so the
+                # string can be sent as-is instead of being parsed and re-encoded
+                json_str = json.dumps(result, cls=CustomJSONEncoder, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
                 json_size_mb = len(json_str) / 1024 / 1024
                 logger.info(f"✅ JSON serialization complete, size: {json_size_mb:.2f} MB")
                 if json_size_mb > 10:
                     logger.warning(f"⚠️ Large response size ({json_size_mb:.2f} MB), may cause performance issues")
-                return JSONResponse(json.loads(json_str))
+                return Response(content=json_str, media_type="application/json")
             except Exception as json_error:
                 logger.error(f"❌ JSON serialization error: {json_error}")
                 # If serialization fails, return error
@@ -11210,34 +11624,41 @@ async def ai_optimization(request: Request):
         zoning_data = None
         
         if polygon_id:
+            conn = None
+            pool = request.app.state.pg_pool
             try:
-                import psycopg2
-                from psycopg2.extras import RealDictCursor
-                
-                conn = psycopg2.connect(
-                    host="localhost",
-                    database="plan-it",
-                    user="postgres",
-                    password="iampro24",
-                    port="5432"
-                )
-                cur = conn.cursor(cursor_factory=RealDictCursor)
+                if pool is None:
+                    raise RuntimeError("database pool not available")
+                conn = pool.getconn()
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                    # Polygon geometry (only when not supplied), latest terrain analysis and
+                    # latest optimization zoning in a single round trip
+                    cur.execute("""
+                        SELECT
+                            (SELECT geojson FROM polygons
+                             WHERE id = %(polygon_id)s AND %(need_polygon)s) AS geojson,
+                            (SELECT results FROM terrain_analyses
+                             WHERE polygon_id = %(polygon_id)s
+                             ORDER BY created_at DESC LIMIT 1) AS terrain_results,
+                            (SELECT row_to_json(z) FROM (
+                                SELECT results, zoning_result, land_use_distribution, zone_statistics
+                                FROM optimization_zoning 
+                                WHERE polygon_id = %(polygon_id)s 
+                                ORDER BY created_at DESC 
+                                LIMIT 1
+                             ) z) AS zoning
+                    """, {"polygon_id": polygon_id, "need_polygon": not polygon_geojson})
+                    db_row = cur.fetchone()
                 
                 # Get polygon geometry
-                if not polygon_geojson:
-                    cur.execute("SELECT geojson FROM polygons WHERE id = %s", (polygon_id,))
-                    polygon_result = cur.fetchone()
-                    if polygon_result and polygon_result['geojson']:
-                        polygon_geojson = polygon_result['geojson']
-                        logger.info(f"✅ Retrieved polygon geometry from database for polygon {polygon_id}")
+                if db_row['geojson']:
+                    polygon_geojson = db_row['geojson']
+                    logger.info(f"✅ Retrieved polygon geometry from database for polygon {polygon_id}")
                 
                 # Get terrain analysis from database
-                cur.execute("SELECT results FROM terrain_analyses WHERE polygon_id = %s ORDER BY created_at DESC LIMIT 1", (polygon_id,))
-                terrain_result = cur.fetchone()
-                if terrain_result and terrain_result['results']:
-                    terrain_data = terrain_result['results']
+                if db_row['terrain_results']:
+                    terrain_data = db_row['terrain_results']
                     if isinstance(terrain_data, str):
-                        import json
                         terrain_data = json.loads(terrain_data)
                     logger.info(f"✅ Retrieved terrain analysis from database for polygon {polygon_id}")
                 
@@ -11250,14 +11671,7 @@ async def ai_optimization(request: Request):
                         break
                 
                 # Get zoning/optimization zoning data
-                cur.execute("""
-                    SELECT results, zoning_result, land_use_distribution, zone_statistics
-                    FROM optimization_zoning 
-                    WHERE polygon_id = %s 
-                    ORDER BY created_at DESC 
-                    LIMIT 1
-                """, (polygon_id,))
-                zoning_result = cur.fetchone()
+                zoning_result = db_row['zoning']
                 if zoning_result:
                     zoning_data = {
                         'results': zoning_result.get('results'),
@@ -11267,8 +11681,7 @@ async def ai_optimization(request: Request):
                     }
                     logger.info(f"✅ Retrieved optimization zoning data from database for polygon {polygon_id}")
                 
-                cur.close()
-                conn.close()
+                conn.rollback()  # end the read transaction before returning the connection
             except Exception as db_error:
                 logger.warning(f"Could not fetch data from database: {db_error}")
                 # Fallback to in-memory stores
@@ -11281,6 +11694,9 @@ async def ai_optimization(request: Request):
                                 break
                     else:
                         terrain_data = terrain_analysis.get('results', {})
+            finally:
+                if conn is not None:
+                    pool.putconn(conn)
         
         # If geojson provided but no terrain data, try to process it
         if polygon_geojson and not terrain_data:
@@ -11350,6 +11766,12 @@ async def ai_optimization(request: Request):
             "error": str(e)
         }, status_code=500)
 
+@functools.lru_cache(maxsize=8)
+def _get_transformer(src_crs, dst_crs):
+    """Shared pyproj Transformer per CRS pair (building the PROJ pipeline is the slow part)."""
+    from pyproj import Transformer
+    return Transformer.from_crs(src_crs, dst_crs, always_xy=True)
+
 async def calculate_current_design_metrics(
     terrain_data: dict = None, 
     geojson: dict = None,
@@ -11374,25 +11796,16 @@ async def calculate_current_design_metrics(
             geom = shape(geojson.get("geometry", geojson))
             # Use proper area calculation - try pyproj if available, otherwise use haversine
             try:
-                from pyproj import Transformer
-                transformer = Transformer.from_crs("EPSG:4326", "EPSG:3857", always_xy=True)
-                
-                # Transform coordinates and calculate area
-                if geom.geom_type == 'Polygon':
-                    coords = list(geom.exterior.coords)
-                    transformed_coords = [transformer.transform(lon, lat) for lon, lat in coords]
-                    from shapely.geometry import Polygon as ShapelyPolygon
-                    transformed_geom = ShapelyPolygon(transformed_coords)
-                    area_sqm = transformed_geom.area
-                elif geom.geom_type == 'MultiPolygon':
-                    total_area = 0
-                    for poly in geom.geoms:
-                        coords = list(poly.exterior.coords)
-                        transformed_coords = [transformer.transform(lon, lat) for lon, lat in coords]
-                        from shapely.geometry import Polygon as ShapelyPolygon
-                        transformed_geom = ShapelyPolygon(transformed_coords)
-                        total_area += transformed_geom.area
-                    area_sqm = total_area
+                transformer = _get_transformer("EPSG:4326", "EPSG:3857")
+                
+                # Transform the exterior ring of every polygon part in one call and sum their areas
+                if geom.geom_type in ('Polygon', 'MultiPolygon'):
+                    exteriors = shapely.polygons(shapely.get_exterior_ring(shapely.get_parts(geom)))
+                    projected = shapely.transform(
+                        exteriors,
+                        lambda lonlat: np.column_stack(transformer.transform(lonlat[:, 0], lonlat[:, 1]))
+                    )
+                    area_sqm = float(shapely.area(projected).sum())
                 else:
                     # Fallback: rough conversion
                     area_sqm = geom.area * 111000 * 111000
@@ -12328,8 +12741,8 @@ async def get_road_network_results():
                 continue
         
         result = {"success": True, "road_networks": serialized_networks}
-        json_str = json.dumps(result, cls=CustomJSONEncoder, ensure_ascii=False)
-        return JSONResponse(json.loads(json_str))
+        json_str = json.dumps(result, cls=CustomJSONEncoder, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+        return Response(content=json_str, media_type="application/json")
     except Exception as e:
         logger.error(f"Error getting road network results: {str(e)}")
         import traceback
@@ -12629,8 +13042,8 @@ async def road_network_design(request: Request):
             "safety_analysis": road_network.get("safety_analysis", {})
         }
         
-        json_str = json.dumps(result, cls=CustomJSONEncoder, ensure_ascii=False)
-        return JSONResponse(json.loads(json_str))
+        json_str = json.dumps(result, cls=CustomJSONEncoder, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+        return Response(content=json_str, media_type="application/json")
         
     except Exception as e:
         logger.error(f"Road network design error: {e}")
@@ -12699,8 +13112,8 @@ async def get_road_network_results():
             "success": True,
             "road_networks": serialized_networks
         }
-        json_str = json.dumps(result, cls=CustomJSONEncoder, ensure_ascii=False)
-        return JSONResponse(json.loads(json_str))
+        json_str = json.dumps(result, cls=CustomJSONEncoder, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+        return Response(content=json_str, media_type="application/json")
     except Exception as e:
         logger.error(f"Error getting road network results: {str(e)}")
         import traceback
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Tests for the residential plot grid fitting in app/main.py
+"""
+
+import sys
+import os
+
+# Add app to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import main
+
+
+def _fit_plot_grid_by_steps(rows, cols, target_count, wide, min_rows):
+    """The original step-by-step grid adjustment that _fit_plot_grid replaces."""
+    if rows * cols < target_count:
+        # Need more plots - grow the long side of the block
+        while rows * cols < target_count and (rows < 20 or cols < 20):
+            if wide:
+                cols += 1
+            else:
+                rows += 1
+    elif rows * cols > target_count:
+        # Need fewer plots - shrink the larger side
+        while rows * cols > target_count and rows > min_rows and cols > 1:
+            if rows > cols:
+                rows -= 1
+            else:
+                cols -= 1
+    return rows, cols
+
+
+def test_fit_plot_grid_matches_step_by_step_adjustment():
+    for rows in range(1, 31):
+        for cols in range(1, 31):
+            for target_count in range(1, 301):
+                for wide in (True, False):
+                    for min_rows in (1, 3):
+                        expected = _fit_plot_grid_by_steps(rows, cols, target_count, wide, min_rows)
+                        assert main._fit_plot_grid(rows, cols, target_count, wide, min_rows) == expected, \
+                            (rows, cols, target_count, wide, min_rows)
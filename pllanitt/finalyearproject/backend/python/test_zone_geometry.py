@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the zoning geometry helpers in app/main.py
+"""
+
+import sys
+import os
+
+# Add app to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from shapely.geometry import box, shape
+
+import main
+
+
+def _zone(coordinates, zone_type='residential'):
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Polygon", "coordinates": [coordinates]},
+        "properties": {"zone_type": zone_type},
+    }
+
+
+BOUNDARY = {"type": "Polygon", "coordinates": [[[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]]]}
+
+
+def test_clip_zone_features_keeps_inside_and_drops_outside():
+    features = [
+        _zone([[1, 1], [3, 1], [3, 3], [1, 3], [1, 1]]),
+        _zone([[20, 20], [22, 20], [22, 22], [20, 22], [20, 20]]),
+        _zone([[8, 8], [12, 8], [12, 12], [8, 12], [8, 8]]),
+        _zone([[1, 1], [2, 1], [2, 2], [1, 1]], zone_type='industrial'),
+    ]
+    clipped = main.clip_zone_features_to_polygon(features, {'residential'}, BOUNDARY)
+    
+    assert set(clipped) == {0, 1, 2}
+    assert clipped[0] == features[0]["geometry"]
+    assert clipped[1] is None
+    assert shape(clipped[2]).equals(shape(box(8, 8, 10, 10)))
+
+
+def test_clip_zone_features_survives_invalid_geometry():
+    # A bow-tie crossing the boundary makes GEOS raise for the whole batch
+    bow_tie = _zone([[8, 8], [12, 12], [12, 8], [8, 12], [8, 8]])
+    crossing = _zone([[8, 0], [12, 0], [12, 2], [8, 2], [8, 0]])
+    inside = _zone([[1, 1], [3, 1], [3, 3], [1, 3], [1, 1]])
+    clipped = main.clip_zone_features_to_polygon([bow_tie, crossing, inside], {'residential'}, BOUNDARY)
+    
+    # Each zone is clipped on its own, exactly like ensure_within_polygon
+    assert clipped[0] == main.ensure_within_polygon(bow_tie["geometry"], BOUNDARY)
+    assert shape(clipped[1]).equals(shape(box(8, 0, 10, 2)))
+    assert clipped[2] == inside["geometry"]
+
+
+def test_run_zoning_pipeline_generates_only_requested_outputs(monkeypatch):
+    calls = []
+    for name in ('generate_buildings_from_zones', 'generate_infrastructure_from_zones', 'identify_green_spaces_from_zones'):
+        monkeypatch.setattr(main, name, lambda zoning, project, polygon, name=name: calls.append(name) or [name])
+    monkeypatch.setattr(main, 'ZONING_PIPELINE_CACHE', main.OrderedDict())
+    zoning_result = {"features": [_zone([[1, 1], [3, 1], [3, 3], [1, 1]])]}
+    
+    assert main.run_zoning_pipeline(zoning_result, 1, BOUNDARY, ['buildings']) == (['generate_buildings_from_zones'],)
+    assert calls == ['generate_buildings_from_zones']
+    
+    # A later request for more outputs only generates the missing ones
+    buildings, green_spaces = main.run_zoning_pipeline(zoning_result, 1, BOUNDARY, ['buildings', 'green_spaces'])
+    assert buildings == ['generate_buildings_from_zones']
+    assert green_spaces == ['identify_green_spaces_from_zones']
+    assert calls == ['generate_buildings_from_zones', 'identify_green_spaces_from_zones']